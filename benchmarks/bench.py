@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de rendimiento de ycurve
+
+Mide cuántas operaciones por segundo hacen la aritmética del cuerpo, las
+operaciones de grupo en coordenadas afines y de López-Dahab, la
+multiplicación escalar y el cifrado de el Gamal sobre las curvas B-m y K-m
+del NIST para m = 163, 233, 283, 409 y 571.
+
+Todas las entradas se generan con una semilla fija. Cada caso se repite
+hasta ocupar ``--min-time`` segundos y se queda el mejor de ``--repeat``
+rondas, que es la medida menos afectada por el ruido del sistema.
+
+Uso::
+
+    python benchmarks/bench.py                          # mostrar resultados
+    python benchmarks/bench.py --save baseline.json     # guardar referencia
+    python benchmarks/bench.py --compare baseline.json  # buscar regresiones
+    python benchmarks/bench.py --sizes 163 --filter scalar_mul
+
+Con ``--compare`` se marcan los casos cuya velocidad baja más de
+``--threshold`` respecto a la referencia y el programa termina con código 1
+si hay alguno. La referencia depende de la máquina en la que se generó.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import re
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ycurve.algorithms.elgamal import ElGamal  # noqa: E402
+from ycurve.ecc.curves import CURVES, build_curve  # noqa: E402
+from ycurve.ecc.ecc import Char2Curve  # noqa: E402
+from ycurve.ffields.ffield import INVERSION_METHODS  # noqa: E402
+
+SIZES = (163, 233, 283, 409, 571)
+SEED = 2024
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def field_cases(m: int, rnd: random.Random) -> Iterator[Case]:
+    e = build_curve(CURVES[f'B-{m}'])
+    field = e.a.field
+    a = field(rnd.getrandbits(m) | 1)
+    b = field(rnd.getrandbits(m) | 1)
+    # c = z^2 + z siempre tiene solución, así que se mide la semitraza y no
+    # solo el cálculo de la traza
+    z = field(rnd.getrandbits(m))
+    c = z.square() + z
+    yield f'F2m.mul[{m}]', lambda: a * b
+    yield f'F2m.square[{m}]', a.square
+    yield f'F2m.sqrt[{m}]', a.sqrt
+    yield f'F2m.solve_quadratic[{m}]', c.solve_quadratic
+    for name, method in INVERSION_METHODS.items():
+        yield f'F2m.inverse.{name}[{m}]', lambda method=method: method(
+            a.n, field,
+        )
+
+
+def curve_cases(m: int, rnd: random.Random) -> Iterator[Case]:
+    e = build_curve(CURVES[f'B-{m}'])
+    g = e.base
+    p = e.scalar_mul(rnd.getrandbits(m), g)
+    yield f'affine.add[{m}]', lambda: e.add(g, p)
+    yield f'affine.double[{m}]', lambda: e.double(p)
+    yield f'affine.halve[{m}]', lambda: e.halve(p)
+
+    params = CURVES[f'B-{m}']
+    ld = Char2Curve(e.a, e.b)
+    ld.set_order(params.order, params.cofactor)
+    ld.set_base_point(g)
+    q, r = ld.to_ld(p), ld.ld_double(ld.to_ld(g))
+    yield f'ld.add_mixed[{m}]', lambda: ld.add(q, g)
+    yield f'ld.add[{m}]', lambda: ld.add(q, r)
+    yield f'ld.double[{m}]', lambda: ld.double(q)
+
+
+def scalar_cases(m: int, rnd: random.Random) -> Iterator[Case]:
+    for kind in ('B', 'K'):
+        e = build_curve(CURVES[f'{kind}-{m}'])
+        g = e.base
+        k = rnd.randrange(1, e.order)
+        p = e.scalar_mul(rnd.randrange(1, e.order), g)
+        e.scalar_mul(k, g)
+        e.scalar_mul(k, p)
+        name = f'{kind}-{m}'
+        yield f'scalar_mul.base[{name}]', lambda e=e, g=g, k=k: (
+            e.scalar_mul(k, g)
+        )
+        yield f'scalar_mul.point[{name}]', lambda e=e, p=p, k=k: (
+            e.scalar_mul(k, p)
+        )
+        yield f'scalar_mul.ladder[{name}]', lambda e=e, p=p, k=k: (
+            e.scalar_mul_ladder(k, p)
+        )
+        if kind == 'B':
+            yield f'scalar_mul.halving[{name}]', lambda e=e, p=p, k=k: (
+                e.scalar_mul_halving(k, p)
+            )
+
+
+def elgamal_cases(m: int, rnd: random.Random) -> Iterator[Case]:
+    e = build_curve(CURVES[f'B-{m}'])
+    private_key = rnd.randrange(1, e.order)
+    publickey = e.scalar_mul(private_key, e.base)
+    msg = e.scalar_mul(rnd.randrange(1, e.order), e.base)
+    cipher = ElGamal(e)
+    c1, c2 = cipher.encrypt_point(msg, publickey)
+    messages = [msg] * 16
+    ciphertexts = cipher.encrypt_many(messages, publickey)
+    yield f'elgamal.encrypt[{m}]', lambda: cipher.encrypt_point(
+        msg, publickey,
+    )
+    yield f'elgamal.decrypt[{m}]', lambda: cipher.decrypt_point(
+        private_key, c1, c2,
+    )
+    # Se cuentan mensajes por segundo, no lotes
+    yield f'elgamal.encrypt_many/16[{m}]', lambda: cipher.encrypt_many(
+        messages, publickey,
+    )
+    yield f'elgamal.decrypt_many/16[{m}]', lambda: cipher.decrypt_many(
+        private_key, ciphertexts,
+    )
+
+
+GROUPS = (field_cases, curve_cases, scalar_cases, elgamal_cases)
+
+
+def measure(fn: Callable[[], object], min_time: float, repeat: int) -> float:
+    """Operaciones por segundo de la mejor de ``repeat`` rondas"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(
+            2, min(10, int(min_time / elapsed) + 1),
+        )
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return number / best
+
+
+def run(
+    sizes: List[int],
+    pattern: Optional[str],
+    min_time: float,
+    repeat: int,
+) -> Dict[str, float]:
+    results = {}
+    for m in sizes:
+        rnd = random.Random(SEED + m)
+        for group in GROUPS:
+            for name, fn in group(m, rnd):
+                if pattern and not re.search(pattern, name):
+                    continue
+                ops = measure(fn, min_time, repeat)
+                batch = re.search(r'/(\d+)\[', name)
+                if batch:
+                    ops *= int(batch.group(1))
+                results[name] = ops
+                print(f'{name:40s} {ops:14.1f} ops/s', flush=True)
+    return results
+
+
+def compare(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float,
+) -> List[str]:
+    """Devuelve los casos más lentos que la referencia"""
+    regressions = []
+    print(f'\n{"caso":40s} {"referencia":>14s} {"actual":>14s} {"cambio":>8s}')
+    for name, ops in results.items():
+        if name not in baseline:
+            continue
+        change = ops / baseline[name] - 1
+        flag = ''
+        if change < -threshold:
+            flag = '  REGRESIÓN'
+            regressions.append(name)
+        print(
+            f'{name:40s} {baseline[name]:14.1f} {ops:14.1f} '
+            f'{change:+8.1%}{flag}'
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--filter', help='Expresión regular sobre el caso')
+    parser.add_argument('--min-time', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', help='Fichero JSON donde guardar')
+    parser.add_argument('--compare', help='Fichero JSON de referencia')
+    parser.add_argument('--threshold', type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.filter, args.min_time, args.repeat)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'meta': {
+                    'python': platform.python_version(),
+                    'machine': platform.machine(),
+                    'platform': platform.platform(),
+                    'date': datetime.date.today().isoformat(),
+                },
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} regresiones por encima del '
+                  f'{args.threshold:.0%}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -23,4 +23,7 @@ setuptools.setup(
     package_dir={"": "ycurve"},
     packages=setuptools.find_packages(where="ycurve"),
     python_requires=">=3.6",
+    extras_require={
+        "numpy": ["numpy"],
+    },
 )
\ No newline at end of file
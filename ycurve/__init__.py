@@ -0,0 +1 @@
+from ycurve.profiling import Profile, profile  # noqa: F401
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Cifrado de el Gamal para código asíncrono
+
+:class:`AsyncElGamal` ofrece versiones ``async`` de
+:meth:`~ycurve.algorithms.elgamal.ElGamal.encrypt_point` y
+:meth:`~ycurve.algorithms.elgamal.ElGamal.decrypt_point` que no bloquean el
+bucle de eventos. Las peticiones que llegan a la vez con la misma llave se
+agrupan en lotes de como mucho ``max_batch_size`` mensajes; un lote se
+envía en cuanto se llena o cuando han pasado ``max_wait`` segundos desde su
+primera petición. Cada lote se resuelve en un proceso de un
+:class:`~ycurve.parallel.CurvePool` con
+:meth:`~ycurve.algorithms.elgamal.ElGamal.encrypt_many` o
+:meth:`~ycurve.algorithms.elgamal.ElGamal.decrypt_many`, que comparten
+precálculos e inversiones entre todos los mensajes.
+
+Ejemplo de uso::
+
+    async with AsyncElGamal(e, workers=4) as cipher:
+        c1, c2 = await cipher.encrypt_point(m, publickey)
+        assert await cipher.decrypt_point(private_key, c1, c2) == m
+
+"""
+import asyncio
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from ycurve.algorithms.elgamal import ElGamal
+from ycurve.ecc.ecc import Curve
+from ycurve.ecc.point import AffinePoint
+from ycurve.parallel import CurvePool
+
+
+def _encrypt_batch(
+    curve: Curve,
+    publickey: AffinePoint,
+    messages: List[AffinePoint],
+) -> List[Tuple[AffinePoint, AffinePoint]]:
+    return ElGamal(curve).encrypt_many(messages, publickey)
+
+
+def _decrypt_batch(
+    curve: Curve,
+    private_key: int,
+    ciphertexts: List[Tuple[AffinePoint, AffinePoint]],
+) -> List[AffinePoint]:
+    return ElGamal(curve).decrypt_many(private_key, ciphertexts)
+
+
+class AsyncElGamal:
+    """
+    Cifrado de el Gamal asíncrono con agrupación de peticiones en lotes.
+
+    :ivar curve: Curva sobre la que se va a trabajar
+    :ivar pool: Procesos en los que se ejecutan los lotes. Si no se indica
+        se crea uno con ``workers`` procesos, que se cierra con
+        :meth:`close`.
+    :ivar max_batch_size: Número máximo de mensajes por lote
+    :ivar max_wait: Segundos que espera un lote incompleto antes de enviarse
+    """
+
+    def __init__(
+        self,
+        curve: Curve,
+        pool: Optional[CurvePool] = None,
+        workers: Optional[int] = None,
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+    ):
+        self.curve = curve
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else CurvePool(curve, workers)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        # Lotes abiertos por llave: (función, llave, entradas, futuros)
+        self._batches: Dict[Hashable, Tuple[Any, Any, list, list]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._running: Set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> 'AsyncElGamal':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def encrypt_point(
+        self,
+        msg: AffinePoint,
+        publickey: AffinePoint,
+    ) -> Tuple[AffinePoint, AffinePoint]:
+        """
+        Cifra un mensaje. Los puntos se validan antes de entrar en el lote,
+        de modo que un punto incorrecto solo hace fallar a su petición.
+        """
+        self.curve.validate(msg)
+        self.curve.validate(publickey)
+        key = ('encrypt', publickey.x.n, publickey.y.n)
+        return await self._submit(key, _encrypt_batch, publickey, msg)
+
+    async def decrypt_point(
+        self,
+        private_key: int,
+        c1: AffinePoint,
+        c2: AffinePoint,
+    ) -> AffinePoint:
+        """Descifra un par (c1, c2)"""
+        self.curve.validate(c1)
+        self.curve.validate(c2)
+        key = ('decrypt', private_key)
+        return await self._submit(key, _decrypt_batch, private_key, (c1, c2))
+
+    def _submit(self, key: Hashable, fn, arg, item) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = (fn, arg, [], [])
+            self._timers[key] = loop.call_later(
+                self.max_wait, self._flush, key,
+            )
+        batch[2].append(item)
+        batch[3].append(future)
+        if len(batch[2]) >= self.max_batch_size:
+            self._flush(key)
+        return future
+
+    def _flush(self, key: Hashable):
+        batch = self._batches.pop(key, None)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if batch is None:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(*batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, fn, arg, items: list, futures: List[asyncio.Future]):
+        try:
+            results = await asyncio.wrap_future(
+                self.pool.submit(fn, arg, items)
+            )
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future, result in zip(futures, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def aclose(self):
+        """Envía los lotes pendientes, espera a que terminen y cierra el
+        conjunto de procesos si se creó aquí"""
+        for key in list(self._batches):
+            self._flush(key)
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        self.close()
+
+    def close(self):
+        if self._owns_pool:
+            self.pool.close()
@@ -17,12 +17,72 @@ Ejemplo de uso::
 
     assert deciphered == m
 
+Para cifrar o descifrar muchos mensajes a la vez es preferible usar
+:meth:`ElGamal.encrypt_many` y :meth:`ElGamal.decrypt_many`::
+
+    ciphered = cipher.encrypt_many([m0, m1, m2], publickey)
+    assert cipher.decrypt_many(private_key, ciphered) == [m0, m1, m2]
+
+y para repartir esas operaciones entre varios procesos se le puede pasar un
+:class:`~ycurve.parallel.CurvePool`::
+
+    with CurvePool(e, workers=4) as pool:
+        cipher = ElGamal(e, pool)
+        ciphered = cipher.encrypt_many(messages, publickey)
+
+Para cifrar datos arbitrarios se usan :meth:`ElGamal.encrypt_stream` y
+:meth:`ElGamal.decrypt_stream`, que trabajan por bloques sobre ficheros::
+
+    with open('datos', 'rb') as src, open('datos.enc', 'wb') as dst:
+        for block in cipher.encrypt_stream(src, publickey):
+            dst.write(block)
+
 """
+import os
 import random
-from typing import Tuple, Optional
+from typing import BinaryIO, Iterator, List, Sequence, Tuple, Optional
 
+from ycurve.algorithms.encoding import KoblitzEncoder
 from ycurve.ecc.ecc import Curve
-from ycurve.ecc.point import Point
+from ycurve.ecc.point import AffinePoint, Point
+from ycurve.parallel import CurvePool
+
+
+def random_scalars(count: int, n: int) -> List[int]:
+    """
+    Genera ``count`` enteros aleatorios en [1, n - 1] con una sola lectura
+    de ``os.urandom``. Cada escalar se obtiene de 8 bytes más de los que
+    ocupa n, de modo que el sesgo al reducir es menor que 2^-64.
+
+    :ivar count: Número de escalares.
+    :ivar n: Orden del grupo.
+    """
+    size = (n.bit_length() + 7) // 8 + 8
+    data = memoryview(os.urandom(count * size))
+    return [
+        int.from_bytes(data[i:i + size], 'big') % (n - 1) + 1
+        for i in range(0, count * size, size)
+    ]
+
+
+def _read_exactly(src: BinaryIO, size: int) -> bytes:
+    """
+    Lee ``size`` bytes de ``src``, o menos solo si se llega al final. Los
+    ficheros sin búfer, como las tuberías, pueden devolver menos bytes de
+    los pedidos sin haber terminado.
+    """
+    data = src.read(size)
+    if len(data) == size or not data:
+        return data
+    parts = [data]
+    missing = size - len(data)
+    while missing:
+        data = src.read(missing)
+        if not data:
+            break
+        parts.append(data)
+        missing -= len(data)
+    return b''.join(parts)
 
 
 class ElGamal:
@@ -30,10 +90,21 @@ class ElGamal:
     Implementación del criptosistema del Gamal
 
     :ivar curve: Curva sobre la que se va a trabajar
+    :ivar pool: Procesos en los que se reparten las operaciones de
+        :meth:`encrypt_many` y :meth:`decrypt_many`, opcional
     """
 
-    def __init__(self, curve: Curve):
+    def __init__(self, curve: Curve, pool: Optional[CurvePool] = None):
         self.curve = curve
+        self.pool = pool
+        self._encoder: Optional[KoblitzEncoder] = None
+
+    @property
+    def encoder(self) -> KoblitzEncoder:
+        """Codificador de bloques de bytes como puntos de la curva"""
+        if self._encoder is None:
+            self._encoder = KoblitzEncoder(self.curve)
+        return self._encoder
 
     def encrypt_point(
         self,
@@ -54,8 +125,9 @@ class ElGamal:
         m = msg
 
         if seed:
-            random.seed(seed)
-        k = random.randint(1, self.curve.order)
+            k = random.Random(seed).randint(1, self.curve.order - 1)
+        else:
+            k = random_scalars(1, self.curve.order)[0]
 
         c1 = self.curve.scalar_mul(k, g)
         c2 = self.curve.add(m, self.curve.scalar_mul(k, publickey))
@@ -76,3 +148,163 @@ class ElGamal:
         """
         p = self.curve.scalar_mul(self.curve.order - private_key, c1)
         return self.curve.add(c2, p)
+
+    def encrypt_many(
+        self,
+        messages: Sequence[AffinePoint],
+        publickey: AffinePoint,
+    ) -> List[Tuple[AffinePoint, AffinePoint]]:
+        """
+        Cifra una lista de mensajes con la misma llave pública.
+
+        La tabla de base fija del punto base se construye si no existe y la
+        curva la aprovecha (ver :meth:`Curve.prefers_base_table`); la de
+        múltiplos de la llave pública queda en la caché de la curva tras el
+        primer mensaje. Los nonces se leen de ``os.urandom`` de una sola
+        vez y todos los resultados se pasan a coordenadas afines con una
+        única inversión.
+
+        :ivar messages: Mensajes que se quieren cifrar
+        :ivar publickey: Llave pública usada en el criptosistema
+        """
+        curve = self.curve
+        curve.validate(publickey)
+        for m in messages:
+            curve.validate(m)
+        if curve.base_table is None and curve.prefers_base_table():
+            curve.precompute_base()
+
+        g = curve.base
+        n = len(messages)
+        if self.pool is not None:
+            scalars = random_scalars(n, curve.order)
+            points = self.pool.scalar_mul_many(
+                scalars * 2, [g] * n + [publickey] * n,
+            )
+            c2 = curve.add_batch(list(zip(points[n:], messages)))
+            return list(zip(points[:n], c2))
+
+        points = []
+        for k, m in zip(random_scalars(n, curve.order), messages):
+            points.append(curve.scalar_mul_projective(k, g))
+            kp = curve.scalar_mul_projective(k, publickey)
+            points.append(curve.projective_add(kp, m))
+        points = curve.normalize_batch(points)
+        return list(zip(points[::2], points[1::2]))
+
+    def decrypt_many(
+        self,
+        private_key: int,
+        ciphertexts: Sequence[Tuple[AffinePoint, AffinePoint]],
+    ) -> List[AffinePoint]:
+        """
+        Descifra una lista de pares (c1, c2) obtenidos con
+        :meth:`encrypt_many` o :meth:`encrypt_point`, normalizando todos los
+        resultados con una única inversión.
+
+        :ivar private_key: Llave privada del sistema
+        :ivar ciphertexts: Pares (c1, c2) cifrados
+        """
+        curve = self.curve
+        k = curve.order - private_key
+        if self.pool is not None:
+            for _, c2 in ciphertexts:
+                curve.validate(c2)
+            points = self.pool.scalar_mul_many(
+                [k] * len(ciphertexts), [c1 for c1, _ in ciphertexts],
+            )
+            return curve.add_batch(
+                [(p, c2) for p, (_, c2) in zip(points, ciphertexts)]
+            )
+
+        points = []
+        for c1, c2 in ciphertexts:
+            curve.validate(c1)
+            curve.validate(c2)
+            kc1 = curve.scalar_mul_projective(k, c1)
+            points.append(curve.projective_add(kc1, c2))
+        return curve.normalize_batch(points)
+
+    def encrypt_stream(
+        self,
+        src: BinaryIO,
+        publickey: AffinePoint,
+        batch_size: int = 64,
+    ) -> Iterator[bytes]:
+        """
+        Cifra el contenido de un fichero binario y devuelve el texto cifrado
+        por trozos. Se leen ``batch_size`` bloques cada vez, así que la
+        memoria usada no depende del tamaño de la entrada.
+
+        Los datos se rellenan con 0x80 seguido de ceros hasta completar un
+        bloque (ISO/IEC 7816-4), cada bloque se codifica como un punto y
+        cada par (c1, c2) se escribe con los dos puntos comprimidos.
+
+        :ivar src: Fichero abierto en modo binario
+        :ivar publickey: Llave pública usada en el criptosistema
+        :ivar batch_size: Número de bloques cifrados a la vez
+        """
+        encoder = self.encoder
+        size = encoder.chunk_size
+        finished = False
+        while not finished:
+            data = _read_exactly(src, size * batch_size)
+            if len(data) < size * batch_size:
+                finished = True
+                data += b'\x80'
+                data += bytes(-len(data) % size)
+            chunks = [data[i:i + size] for i in range(0, len(data), size)]
+            messages = encoder.encode_many(chunks)
+            pairs = self.encrypt_many(messages, publickey)
+            for i, (c1, c2) in enumerate(pairs):
+                # c2 es el infinito con probabilidad 1/n; se vuelve a cifrar
+                # para que todos los registros tengan la misma longitud
+                while c2.is_inf():
+                    c1, c2 = self.encrypt_many([messages[i]], publickey)[0]
+                pairs[i] = (c1, c2)
+            yield b''.join(
+                c1.to_bytes(compressed=True) + c2.to_bytes(compressed=True)
+                for c1, c2 in pairs
+            )
+
+    def decrypt_stream(
+        self,
+        src: BinaryIO,
+        private_key: int,
+        batch_size: int = 64,
+    ) -> Iterator[bytes]:
+        """
+        Descifra por trozos un fichero generado con :meth:`encrypt_stream`.
+        El último bloque descifrado se retiene hasta llegar al final para
+        poder quitar el relleno.
+
+        :ivar src: Fichero abierto en modo binario
+        :ivar private_key: Llave privada del sistema
+        :ivar batch_size: Número de bloques descifrados a la vez
+        """
+        encoder = self.encoder
+        record = 2 * (1 + self.curve.a.field.byte_length)
+        last = None
+        while True:
+            data = _read_exactly(src, record * batch_size)
+            if len(data) % record:
+                raise ValueError('El texto cifrado está truncado')
+            if not data:
+                break
+            points = self.curve.decode_points(data)
+            pairs = list(zip(points[::2], points[1::2]))
+            messages = self.decrypt_many(private_key, pairs)
+            chunks = [encoder.decode(p) for p in messages]
+            if last is not None:
+                chunks.insert(0, last)
+            last = chunks.pop()
+            if chunks:
+                yield b''.join(chunks)
+
+        if last is None:
+            raise ValueError('El texto cifrado está vacío')
+        data = last.rstrip(b'\x00')
+        if not data.endswith(b'\x80'):
+            raise ValueError('Relleno incorrecto')
+        if data[:-1]:
+            yield data[:-1]
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Codificación de bytes como puntos de una curva
+
+Se usa el método de Koblitz: un bloque de ``chunk_size`` bytes se escribe
+en los bits altos de la coordenada x y el último byte se deja como
+contador. Se prueban valores del contador hasta que la ecuación
+z^2 + z = x + a + b / x^2 tiene solución y el punto obtenido está en el
+subgrupo de orden n, lo que ocurre con probabilidad 1 / (2h) en cada
+intento, y la y del punto se obtiene de esa solución.
+
+Restringir los mensajes al subgrupo es necesario para el cifrado: c2 = M + kQ
+está en el subgrupo si y solo si lo está M, así que un punto fuera de él
+revelaría información sobre el bloque.
+
+Ejemplo de uso::
+
+    encoder = KoblitzEncoder(e)
+    points = encoder.encode_many([b'hola'.ljust(encoder.chunk_size, b' ')])
+    assert encoder.decode(points[0]).startswith(b'hola')
+
+"""
+from typing import List, Sequence
+
+from ycurve.ecc.ecc import Char2NonSupersingularCurve
+from ycurve.ecc.point import AffinePoint
+from ycurve.errors import InvalidPoint
+from ycurve.ffields.ffield import batch_inverse
+
+# Valores posibles del byte contador
+COUNTER = 256
+
+
+class KoblitzEncoder:
+    """
+    Codifica bloques de bytes de tamaño fijo como puntos de la curva y los
+    recupera a partir de la coordenada x.
+
+    :ivar curve: Curva en la que se codifican los bloques.
+    :ivar chunk_size: Bytes por punto, ``floor((m - 8) / 8)``.
+    """
+
+    def __init__(self, curve: Char2NonSupersingularCurve):
+        self.curve = curve
+        self.chunk_size = (curve.a.field.m - 8) // 8
+        if self.chunk_size < 1:
+            raise ValueError('El cuerpo es demasiado pequeño')
+
+    def encode(self, chunk: bytes) -> AffinePoint:
+        """Codifica un bloque de ``chunk_size`` bytes"""
+        return self.encode_many([chunk])[0]
+
+    def encode_many(self, chunks: Sequence[bytes]) -> List[AffinePoint]:
+        """
+        Codifica varios bloques. En cada ronda se invierten a la vez las x
+        de todos los bloques pendientes y los que no dan un punto del
+        subgrupo de orden n pasan al siguiente valor del contador.
+        """
+        curve = self.curve
+        field = curve.a.field
+        size = self.chunk_size
+        values = []
+        for chunk in chunks:
+            if len(chunk) != size:
+                raise ValueError(f'Los bloques deben tener {size} bytes')
+            values.append(int.from_bytes(chunk, 'big') << 8)
+
+        points: List[AffinePoint] = [None] * len(values)
+        pending = list(range(len(values)))
+        for counter in range(COUNTER):
+            xs = [field(values[i] | counter) for i in pending]
+            inverses = batch_inverse([x for x in xs if x != 0])
+            inverses.reverse()
+            failed = []
+            for i, x in zip(pending, xs):
+                x_inv = inverses.pop() if x != 0 else None
+                try:
+                    p = curve.decompress_point(x, 0, x_inv)
+                except InvalidPoint:
+                    failed.append(i)
+                    continue
+                if curve.in_subgroup(p):
+                    points[i] = p
+                else:
+                    failed.append(i)
+            pending = failed
+            if not pending:
+                return points
+        raise ValueError('No se ha encontrado ningún punto para el bloque')
+
+    def decode(self, p: AffinePoint) -> bytes:
+        """Recupera el bloque codificado en el punto"""
+        if p.is_inf() or p.x.n >> (8 * self.chunk_size + 8):
+            raise ValueError('El punto no codifica ningún bloque')
+        return (p.x.n >> 8).to_bytes(self.chunk_size, 'big')
@@ -31,21 +31,67 @@ Ejemplo de uso para definir la curva K409::
 
     return (c, power, irreducible)
 
+Las curvas estándar del NIST ya están definidas en :mod:`ycurve.ecc.curves`::
+
+    from ycurve.ecc.curves import get_curve
+
+    c = get_curve('K-409')
+
 """
 # type: ignore
 from abc import ABC, abstractmethod
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
 
-from ycurve.ffields.ffield import F2m
+from ycurve.ffields.ffield import F2m, batch_inverse
 from ycurve.ecc.ldpoint import LDPointChar2
+from ycurve.ecc.precomp import FixedBaseTable, LRUCache
+from ycurve.ecc.recoding import (
+    TauElement,
+    tau_exact_div,
+    tau_mod,
+    tau_power,
+    tnaf_constants,
+    wnaf,
+    wtnaf,
+)
 from ycurve.ecc.point import AffinePoint, Point
 from ycurve.errors import InvalidPoint
 
 
+# Número de sumandos a partir del cual multi_scalar_mul usa Pippenger. Por
+# debajo el método de Straus hace menos sumas, ya que Pippenger necesita
+# sumas en coordenadas proyectivas completas para combinar las cubetas.
+PIPPENGER_THRESHOLD = 512
+
+
 class Curve(ABC):
     """
     Interfaz para trabajar con curvas elípticas.
+
+    La multiplicación escalar usa la forma no adyacente de anchura
+    ``window`` del escalar. Las tablas de múltiplos impares de cada punto se
+    guardan en una caché de ``cache_size`` entradas, de modo que multiplicar
+    repetidamente el mismo punto (por ejemplo una llave pública) no las
+    recalcula.
+
+    :ivar window: Anchura de ventana usada por defecto en ``scalar_mul``.
+    :ivar multiples: Caché de las tablas de múltiplos impares por punto.
+    :ivar base_table: Tabla de base fija del punto base, ver
+        :meth:`precompute_base`.
+    :ivar lazy_base_table: Si es cierto, la tabla de base fija se construye
+        la primera vez que se multiplica el punto base.
     """
 
+    window = 4
+    base_window = 4
+    cache_size = 32
+
+    def __init__(self):
+        self.multiples = LRUCache(self.cache_size)
+        self.base = None
+        self.base_table: Optional[FixedBaseTable] = None
+        self.lazy_base_table = False
+
     @abstractmethod
     def double(self, p: Point) -> Point:
         """Realiza la operación 2P para un punto P de la curva"""
@@ -61,29 +107,418 @@ class Curve(ABC):
         """Comprueba si un punto P pertenece a la curva"""
         pass
 
+    @abstractmethod
+    def negate(self, p: AffinePoint) -> AffinePoint:
+        """Calcula -P para un punto P de la curva"""
+        pass
+
+    def infinity(self) -> AffinePoint:
+        """Punto del infinito"""
+        return AffinePoint(None, self.a.field.zero)
+
+    def validate(self, p: Point) -> Point:
+        """
+        Comprueba que P pertenece a la curva y lo devuelve. Es la única
+        comprobación que se hace sobre puntos externos: las operaciones
+        internas suponen que sus argumentos ya son válidos.
+        """
+        if not p.is_inf() and not self.contains(p):
+            raise InvalidPoint(p)
+        return p
+
+    def unchecked_add(self, p: Point, q: Point) -> Point:
+        """P + Q sin comprobar que los puntos pertenecen a la curva"""
+        return self.add(p, q)
+
+    def unchecked_double(self, p: Point) -> Point:
+        """2P sin comprobar que el punto pertenece a la curva"""
+        return self.double(p)
+
+    # Las siguientes operaciones son las que usan los algoritmos de
+    # multiplicación escalar. Por defecto trabajan en coordenadas afines;
+    # las curvas pueden redefinirlas para usar otra representación interna.
+
+    def lift(self, p: AffinePoint) -> Point:
+        """Pasa un punto afín a la representación interna"""
+        return p
+
+    def projective_double(self, p: Point) -> Point:
+        """Calcula 2P en la representación interna"""
+        return self.unchecked_double(p)
+
+    def projective_add(self, p: Point, q: AffinePoint) -> Point:
+        """Calcula P + Q con P en la representación interna y Q afín"""
+        return self.unchecked_add(p, q)
+
+    def projective_sum(self, p: Point, q: Point) -> Point:
+        """Calcula P + Q con ambos puntos en la representación interna"""
+        return self.unchecked_add(p, q)
+
+    def normalize(self, p: Point) -> AffinePoint:
+        """Pasa un punto de la representación interna a coordenadas afines"""
+        return p
+
+    def normalize_batch(self, points: Sequence[Point]) -> List[AffinePoint]:
+        """Pasa a coordenadas afines una lista de puntos"""
+        return [self.normalize(p) for p in points]
+
+    def add_batch(
+        self,
+        pairs: Sequence[Tuple[AffinePoint, AffinePoint]],
+    ) -> List[AffinePoint]:
+        """Calcula P + Q para cada pareja de puntos afines"""
+        return [self.unchecked_add(p, q) for p, q in pairs]
+
+    def odd_multiples(
+        self,
+        p: AffinePoint,
+        w: int,
+    ) -> Tuple[List[AffinePoint], List[AffinePoint]]:
+        """
+        Devuelve las listas [P, 3P, ..., (2^(w-1) - 1)P] y sus opuestos.
+        Las tablas se guardan en la caché ``multiples``.
+
+        Los múltiplos se acumulan en la representación interna sumando 2P
+        y se pasan a afines todos a la vez con :meth:`normalize_batch`.
+        """
+        key = (p.x.n, p.y.n, w)
+        table = self.multiples.get(key)
+        if table is None:
+            positives = [p]
+            if w > 2:
+                p2 = self.normalize(self.projective_double(self.lift(p)))
+                acc, accs = self.lift(p), []
+                for _ in range((1 << (w - 2)) - 1):
+                    acc = self.projective_add(acc, p2)
+                    accs.append(acc)
+                positives.extend(self.normalize_batch(accs))
+            table = (positives, [self.negate(q) for q in positives])
+            self.multiples[key] = table
+        return table
+
+    def multiples_table(
+        self,
+        p: AffinePoint,
+        w: Optional[int] = None,
+    ) -> Tuple[Hashable, List[AffinePoint]]:
+        """
+        Devuelve la clave en ``multiples`` y los múltiplos positivos de la
+        tabla que usa :meth:`scalar_mul` para P, construyéndola si hace
+        falta. Sirve para guardar las tablas y restaurarlas con
+        :meth:`install_multiples`.
+        """
+        w = w or self.window
+        return (p.x.n, p.y.n, w), self.odd_multiples(p, w)[0]
+
+    def install_multiples(
+        self,
+        key: Hashable,
+        positives: Sequence[AffinePoint],
+    ):
+        """Guarda en la caché una tabla obtenida con
+        :meth:`multiples_table`"""
+        self.multiples[key] = (positives, [self.negate(q) for q in positives])
+
     def scalar_mul(self, k: int, p: Point) -> Point:
-        """Realiza la operación kP para un entero k y un punto P"""
-        if isinstance(p, AffinePoint):
-            output = AffinePoint(None, F2m(0, 3))
-        else:
-            return AffinePoint(None, F2m(0, 3))
-        #   while k > 0:
-        #    if k % 2 == 1:
-        #        output = self.add(output, p)
-        #    p = self.double(p)
-        #    k //= 2
-        bin_k = "".join(bin(k)[2:])
-        for i, ki in enumerate(bin_k):
-            output = self.double(output)
-            if ki == '1':
-                output = self.add(p, output)
-        return output
+        """
+        Realiza la operación kP para un entero k y un punto P. P se valida
+        una sola vez, salvo que sea el punto base, que ya se validó en
+        :meth:`set_base_point`.
+        """
+        if p is not self.base:
+            self.validate(p)
+        return self.scalar_mul_unchecked(k, p)
+
+    def scalar_mul_unchecked(self, k: int, p: Point) -> Point:
+        """kP sin validar P, eligiendo el método más adecuado"""
+        return self.normalize(self.scalar_mul_projective(k, p))
+
+    def scalar_mul_projective(self, k: int, p: AffinePoint) -> Point:
+        """
+        Como :meth:`scalar_mul_unchecked`, pero deja el resultado en la
+        representación interna para poder normalizar muchos resultados a la
+        vez con :meth:`normalize_batch`.
+        """
+        if self.has_base_table(p):
+            return self._fixed_base_mul(k)
+        return self._wnaf_mul(k, p)
+
+    def scalar_mul_batch(
+        self,
+        terms: Sequence[Tuple[int, AffinePoint]],
+    ) -> List[AffinePoint]:
+        """
+        Calcula k_i P_i para cada par de la lista compartiendo una única
+        normalización final. Cada punto se valida una vez.
+        """
+        results = []
+        for k, p in terms:
+            if p is not self.base:
+                self.validate(p)
+            results.append(self.scalar_mul_projective(k, p))
+        return self.normalize_batch(results)
+
+    def prefers_base_table(self) -> bool:
+        """
+        Indica si compensa construir la tabla de base fija para multiplicar
+        muchas veces el punto base
+        """
+        return True
+
+    def has_base_table(self, p: Point) -> bool:
+        """
+        Indica si P es el punto base y tiene tabla de base fija. Si la tabla
+        está pendiente (``lazy_base_table``) se construye en este momento.
+        """
+        if self.base_table is None and not self.lazy_base_table:
+            return False
+        if not (p is self.base or p == self.base):
+            return False
+        if self.base_table is None:
+            self.lazy_base_table = False
+            if self.prefers_base_table():
+                self.precompute_base()
+        return self.base_table is not None
+
+    def scalar_mul_wnaf(
+        self,
+        k: int,
+        p: AffinePoint,
+        w: Optional[int] = None,
+    ) -> AffinePoint:
+        """
+        Calcula kP recorriendo la forma no adyacente de anchura ``w`` de k
+        de izquierda a derecha. Algorithm 3.36
 
-    def set_order(self, n: int):
+        Se hacen del orden de log(k) / (w + 1) sumas en lugar de las
+        log(k) / 2 del método binario.
+        """
+        if p is not self.base:
+            self.validate(p)
+        return self.normalize(self._wnaf_mul(k, p, w))
+
+    def _wnaf_mul(
+        self,
+        k: int,
+        p: AffinePoint,
+        w: Optional[int] = None,
+    ) -> Point:
+        w = w or self.window
+        if k < 0:
+            k, p = -k, self.negate(p)
+        if k == 0 or p.is_inf():
+            return self.lift(self.infinity())
+        positives, negatives = self.odd_multiples(p, w)
+        double, add = self.projective_double, self.projective_add
+        q = self.lift(self.infinity())
+        for d in reversed(wnaf(k, w)):
+            q = double(q)
+            if d > 0:
+                q = add(q, positives[d >> 1])
+            elif d < 0:
+                q = add(q, negatives[-d >> 1])
+        return q
+
+    def multi_scalar_mul(
+        self,
+        terms: Sequence[Tuple[int, Point]],
+        w: Optional[int] = None,
+    ) -> AffinePoint:
+        """
+        Calcula k_1 P_1 + ... + k_n P_n compartiendo los doblados entre todos
+        los sumandos. Con pocos sumandos se usa el método de Straus
+        (:meth:`multi_scalar_mul_straus`) y a partir de
+        ``PIPPENGER_THRESHOLD`` el de Pippenger
+        (:meth:`multi_scalar_mul_pippenger`).
+
+        :ivar terms: Lista de pares (k_i, P_i).
+        """
+        terms = self._prepare_terms(terms)
+        for _, p in terms:
+            if p is not self.base:
+                self.validate(p)
+        if len(terms) >= PIPPENGER_THRESHOLD:
+            return self.multi_scalar_mul_pippenger(terms)
+        return self.multi_scalar_mul_straus(terms, w)
+
+    def _prepare_terms(
+        self,
+        terms: Sequence[Tuple[int, Point]],
+    ) -> List[Tuple[int, AffinePoint]]:
+        """Pasa los puntos a coordenadas afines y hace positivos los
+        escalares, descartando los términos nulos"""
+        prepared = []
+        for k, p in terms:
+            if not isinstance(p, AffinePoint):
+                p = self.normalize(p)
+            if k < 0:
+                k, p = -k, self.negate(p)
+            if k and not p.is_inf():
+                prepared.append((k, p))
+        return prepared
+
+    def multi_scalar_mul_straus(
+        self,
+        terms: Sequence[Tuple[int, AffinePoint]],
+        w: Optional[int] = None,
+    ) -> AffinePoint:
+        """
+        Método de Straus con wNAF entrelazadas. Algorithm 3.51
+
+        Se recorren a la vez las wNAF de todos los escalares, haciendo un
+        único doblado por bit y sumando los múltiplos impares precalculados
+        de cada punto cuando su dígito no es nulo.
+        """
+        w = w or self.window
+        terms = self._prepare_terms(terms)
+        if not terms:
+            return self.infinity()
+        expansions = []
+        for k, p in terms:
+            positives, negatives = self.odd_multiples(p, w)
+            expansions.append((wnaf(k, w), positives, negatives))
+        length = max(len(digits) for digits, _, _ in expansions)
+
+        double, add = self.projective_double, self.projective_add
+        q = self.lift(self.infinity())
+        for i in range(length - 1, -1, -1):
+            q = double(q)
+            for digits, positives, negatives in expansions:
+                if i < len(digits):
+                    d = digits[i]
+                    if d > 0:
+                        q = add(q, positives[d >> 1])
+                    elif d < 0:
+                        q = add(q, negatives[-d >> 1])
+        return self.normalize(q)
+
+    def multi_scalar_mul_pippenger(
+        self,
+        terms: Sequence[Tuple[int, AffinePoint]],
+        c: Optional[int] = None,
+    ) -> AffinePoint:
+        """
+        Método de Pippenger. Los escalares se dividen en ventanas de c bits.
+        En cada ventana se suma cada punto a la cubeta de su dígito y las
+        cubetas se combinan con sumas acumuladas:
+
+            sum_j j B_j = B_m + (B_m + B_(m-1)) + ... + (B_m + ... + B_1)
+
+        Cada ventana cuesta n + 2^(c+1) sumas y c doblados compartidos.
+
+        :ivar c: Anchura de ventana. Por defecto la que minimiza el número de
+            sumas ceil(t / c) (n + 2^(c+1)).
+        """
+        terms = self._prepare_terms(terms)
+        if not terms:
+            return self.infinity()
+        bits = max(k.bit_length() for k, _ in terms)
+        if c is None:
+            c = min(range(2, 17), key=lambda c: (
+                -(-bits // c) * (len(terms) + (2 << c))
+            ))
+        mask = (1 << c) - 1
+
+        double, add, add_full = (
+            self.projective_double, self.projective_add, self.projective_sum,
+        )
+        infinity = self.lift(self.infinity())
+        q = infinity
+        for shift in range((bits - 1) // c * c, -1, -c):
+            for _ in range(c):
+                q = double(q)
+            buckets = [infinity] * (mask + 1)
+            for k, p in terms:
+                d = (k >> shift) & mask
+                if d:
+                    buckets[d] = add(buckets[d], p)
+            running = acc = infinity
+            for d in range(mask, 0, -1):
+                running = add_full(running, buckets[d])
+                acc = add_full(acc, running)
+            q = add_full(q, acc)
+        return self.normalize(q)
+
+    def precompute_base(self, w: Optional[int] = None) -> FixedBaseTable:
+        """
+        Construye la tabla de base fija P_i = 2^(w i) G del punto base G con
+        d = ceil(t / w) entradas, siendo t el número de bits del orden. A
+        partir de entonces ``scalar_mul`` usa
+        :meth:`scalar_mul_fixed_base` para los múltiplos de G.
+        """
+        w = w or self.base_window
+        bits = self.order.bit_length() if hasattr(self, 'order') else (
+            self.a.field.m + 1
+        )
+        q = self.lift(self.base)
+        points = []
+        for _ in range((bits + w - 1) // w):
+            points.append(q)
+            for _ in range(w):
+                q = self.projective_double(q)
+        self.base_table = FixedBaseTable(w, self.normalize_batch(points))
+        return self.base_table
+
+    def scalar_mul_fixed_base(self, k: int) -> AffinePoint:
+        """
+        Calcula kG para el punto base G con el método de ventana de base
+        fija. Algorithm 3.41
+
+        Escribiendo k = sum K_i 2^(w i), se acumulan en B los P_i con
+        K_i = j para j desde 2^w - 1 hasta 1, sumando B a A en cada paso.
+        No se hace ningún doblado y el número de sumas es d + 2^w - 2.
+        """
+        return self.normalize(self._fixed_base_mul(k))
+
+    def _fixed_base_mul(self, k: int) -> Point:
+        table = self.base_table
+        if table is None:
+            table = self.precompute_base()
+        if hasattr(self, 'order'):
+            k %= self.order
+        elif k < 0 or k.bit_length() > table.max_bits:
+            return self._wnaf_mul(k, self.base)
+        w = table.window
+        mask = (1 << w) - 1
+        digits = [(k >> (w * i)) & mask for i in range(len(table))]
+        buckets: List[List[int]] = [[] for _ in range(mask + 1)]
+        for i, d in enumerate(digits):
+            if d:
+                buckets[d].append(i)
+
+        points = table.points
+        a = b = self.lift(self.infinity())
+        for j in range(mask, 0, -1):
+            for i in buckets[j]:
+                b = self.projective_add(b, points[i])
+            a = self.projective_sum(a, b)
+        return a
+
+    def set_order(self, n: int, cofactor: Optional[int] = None):
+        """
+        Fija el orden primo n del punto base y, si se conoce, el cofactor h,
+        con #E = h n.
+        """
         self.order = n
+        self.cofactor = cofactor
 
-    def set_base_point(self, p: Point):
-        self.base = p
+    def set_base_point(
+        self,
+        p: Point,
+        precompute: bool = False,
+        lazy: bool = False,
+    ):
+        """
+        Fija el punto base de la curva. Si ``precompute`` es cierto se
+        construye además su tabla de base fija; si ``lazy`` es cierto se
+        construirá la primera vez que se multiplique el punto base, siempre
+        que la curva la aproveche (ver :meth:`prefers_base_table`).
+        """
+        self.base = self.validate(p)
+        self.base_table = None
+        self.lazy_base_table = lazy
+        if precompute:
+            self.precompute_base()
 
 
 class Char2NonSupersingularCurve(Curve):
@@ -95,23 +530,65 @@ class Char2NonSupersingularCurve(Curve):
     """
 
     def __init__(self, a: F2m, b: F2m):
+        super().__init__()
         self.a = a
         self.b = b
+        self.tau_divisors: Dict[bool, TauElement] = {}
 
     def contains(self, p: Point) -> bool:
-        left = p.y * p.y + p.x * p.y
-        rigth = p.x * p.x * p.x + self.a * p.x * p.x + self.b
+        if isinstance(p, LDPointChar2):
+            # Y^2 + XYZ = X^3 Z + a X^2 Z^2 + b Z^4
+            z_2 = p.z.square()
+            x_2 = p.x.square()
+            left = p.y.square() + p.x * p.y * p.z
+            rigth = (
+                x_2 * p.x * p.z + self.a * x_2 * z_2 + self.b * z_2.square()
+            )
+            return left == rigth
+        x_2 = p.x.square()
+        left = p.y.square() + p.x * p.y
+        rigth = x_2 * p.x + self.a * x_2 + self.b
         return left == rigth
 
+    def in_subgroup(self, p: AffinePoint) -> bool:
+        """
+        Comprueba si un punto de la curva está en el subgrupo de orden n.
+        La parte de orden par del grupo es cíclica, así que con cofactor 2
+        el subgrupo es 2E, formado por los puntos con Tr(x) = Tr(a), y con
+        cofactor 4 es 4E: además una mitad Q de P, cuya x cumple
+        x_Q^2 = y + x lambda + x con lambda^2 + lambda = x + a, debe tener
+        Tr(x_Q) = Tr(a). Con otros cofactores se comprueba que nP = O.
+        """
+        if p.is_inf():
+            return True
+        x = p.x
+        if x == 0:
+            # (0, sqrt(b)) tiene orden 2
+            return False
+        cofactor = getattr(self, 'cofactor', None)
+        if cofactor in (2, 4):
+            trace_a = self.a.trace()
+            if x.trace() != trace_a:
+                return False
+            if cofactor == 2:
+                return True
+            lmd = (x + self.a).solve_quadratic()
+            return (p.y + x * lmd + x).trace() == trace_a
+        return self.to_affine(self._ld_scalar_mul(self.order, p)).is_inf()
+
     def add(self, p: AffinePoint, q: AffinePoint) -> AffinePoint:
+        """P + Q comprobando antes que ambos puntos están en la curva"""
+        self.validate(p)
+        self.validate(q)
+        return self.unchecked_add(p, q)
+
+    def unchecked_add(self, p: AffinePoint, q: AffinePoint) -> AffinePoint:
         if p.x is None:
             return q
         if q.x is None:
             return p
-        if not self.contains(q):
-            raise InvalidPoint()
         if p == q:
-            return self.double(p)
+            return self.unchecked_double(p)
         t0 = p.y + q.y
         t1 = p.x + q.x
         if t1 == 0:
@@ -119,67 +596,537 @@ class Char2NonSupersingularCurve(Curve):
             return AffinePoint(None, 0)
         t3 = t1.inverse()
         lmd = t0 * t3
-        lmd_2 = lmd * lmd
+        lmd_2 = lmd.square()
 
         x3 = lmd_2 + lmd
         x3 = x3 + p.x + q.x + self.a
         y3 = lmd * (p.x + x3) + x3 + p.y
-        assert self.contains(AffinePoint(x3, y3))
         return AffinePoint(x3, y3)
 
     def double(self, p: AffinePoint) -> AffinePoint:
+        """2P comprobando antes que el punto está en la curva"""
+        return self.unchecked_double(self.validate(p))
+
+    def unchecked_double(self, p: AffinePoint) -> AffinePoint:
         if p.x == 0:
             raise ZeroDivisionError
         elif p.x is None:
             return p
-        if not self.contains(p):
-            raise InvalidPoint(p)
         x1_inv = p.x.inverse()
-        x1_2 = p.x * p.x
+        x1_2 = p.x.square()
         t0 = p.y * x1_inv
         lmd = p.x + t0
-        x3 = lmd * lmd + lmd + self.a
+        x3 = lmd.square() + lmd + self.a
         y3 = x1_2 + x3 + x3 * lmd
         return AffinePoint(x3, y3)
 
+    def negate(self, p: AffinePoint) -> AffinePoint:
+        """-(x, y) = (x, x + y)"""
+        if p.x is None:
+            return p
+        return AffinePoint(p.x, p.x + p.y)
 
-class Char2Curve(Char2NonSupersingularCurve):
-    """
-    Curvas no supersingulares de la forma y^2 + xy = x^3 + ax^2 + b
-    con coordenadas de Lopez Dahab
+    def decompress_point(
+        self,
+        x: F2m,
+        y_bit: int,
+        x_inv: Optional[F2m] = None,
+    ) -> AffinePoint:
+        """
+        Recupera el punto (x, y) a partir de x y del bit menos significativo
+        de z = y / x. SEC 1, sección 2.3.4
 
-    :ivar a: Coeficiente a de la ecuación
-    :ivar b: Coeficiente b de la ecuación
-    """
+        Si x = 0 el punto es (0, sqrt(b)). En otro caso z es una solución de
+        z^2 + z = x + a + b / x^2, que existe si y solo si el punto está en
+        la curva, y la otra solución es z + 1.
+
+        :ivar x_inv: Inverso de x si ya se conoce.
+        """
+        if x == 0:
+            return AffinePoint(x, self.b.sqrt())
+        if x_inv is None:
+            x_inv = x.inverse()
+        z = (x + self.a + self.b * x_inv.square()).solve_quadratic()
+        if z is None:
+            raise InvalidPoint(x)
+        if z.n & 1 != y_bit:
+            z = z + self.a.field.one
+        return AffinePoint(x, x * z)
+
+    def decode_point(self, data: bytes) -> AffinePoint:
+        """
+        Decodifica un punto codificado con :meth:`AffinePoint.to_bytes`,
+        comprimido o no, y comprueba que está en la curva.
+        """
+        points = self.decode_points(data)
+        if len(points) != 1:
+            raise ValueError('Se esperaba un único punto')
+        return points[0]
+
+    def decode_points(self, buffer: bytes) -> List[AffinePoint]:
+        """
+        Decodifica una secuencia de puntos concatenados, que pueden estar
+        comprimidos o no. El búfer se recorre con una vista de memoria, sin
+        copiar los bytes de cada coordenada, y los inversos de las x de los
+        puntos comprimidos se calculan con una única inversión.
+        """
+        field = self.a.field
+        size = field.byte_length
+        view = memoryview(buffer).cast('B')
+        entries: List[Tuple[int, Optional[F2m], Optional[F2m]]] = []
+        i = 0
+        while i < len(view):
+            prefix = view[i]
+            if prefix == 0:
+                entries.append((prefix, None, None))
+                i += 1
+            elif prefix in (2, 3):
+                x = field.from_bytes(view[i + 1:i + 1 + size])
+                entries.append((prefix, x, None))
+                i += 1 + size
+            elif prefix == 4:
+                x = field.from_bytes(view[i + 1:i + 1 + size])
+                y = field.from_bytes(view[i + 1 + size:i + 1 + 2 * size])
+                entries.append((prefix, x, y))
+                i += 1 + 2 * size
+            else:
+                raise ValueError(f'Prefijo desconocido {prefix:#04x}')
+
+        inverses = iter(batch_inverse([
+            x for prefix, x, _ in entries if prefix in (2, 3) and x != 0
+        ]))
+        points = []
+        for prefix, x, y in entries:
+            if prefix == 0:
+                points.append(self.infinity())
+            elif prefix == 4:
+                points.append(self.validate(AffinePoint(x, y)))
+            else:
+                x_inv = None if x == 0 else next(inverses)
+                points.append(self.decompress_point(x, prefix & 1, x_inv))
+        return points
 
-    def double(self, p: LDPointChar2):
-        # If it is infinity point
+    def scalar_mul(self, k: int, p: Point) -> AffinePoint:
+        """
+        Realiza la operación kP para un entero k y un punto P. Los cálculos
+        intermedios se hacen en coordenadas de López-Dahab.
+        """
+        if isinstance(p, LDPointChar2):
+            p = self.to_affine(p)
+        return super().scalar_mul(k, p)
+
+    def scalar_mul_projective(self, k: int, p: AffinePoint) -> LDPointChar2:
+        if self.is_koblitz() and not self.has_base_table(p):
+            return self._tnaf_mul(k, p)
+        return super().scalar_mul_projective(k, p)
+
+    def scalar_mul_ladder(
+        self,
+        k: int,
+        p: AffinePoint,
+        subgroup: Optional[bool] = None,
+    ) -> AffinePoint:
+        """
+        Calcula kP con la escalera de Montgomery de López y Dahab, usando solo
+        las coordenadas (X, Z). Algorithm 3.40
+
+        Cada bit del escalar cuesta lo mismo (unas 6 multiplicaciones y 5
+        cuadrados) con independencia de su valor y no hay inversiones en el
+        bucle. La coordenada y se recupera al final con una única inversión.
+        Si se conoce un múltiplo N del orden de P el escalar se sustituye por
+        k + N o k + 2N, de modo que todos los escalares recorren el mismo
+        número de pasos. Si ``subgroup`` es cierto (por defecto, si P es el
+        punto base) se usa N = n; si no, el orden de la curva h n, siempre
+        que se haya indicado el cofactor en :meth:`set_order`.
+        """
+        if p is not self.base:
+            self.validate(p)
+        if subgroup is None:
+            subgroup = p is self.base
+        if k < 0:
+            k, p = -k, self.negate(p)
+        if p.is_inf():
+            return p
+        n = getattr(self, 'order', None)
+        if not subgroup:
+            cofactor = getattr(self, 'cofactor', None)
+            n = n * cofactor if n and cofactor else None
+        if n:
+            k %= n
+            if k == 0:
+                return self.infinity()
+            k = k + n if (k + n).bit_length() > n.bit_length() else k + 2 * n
+        if k == 0:
+            return self.infinity()
+        x, y, b = p.x, p.y, self.b
+        if x == 0:
+            # P tiene orden 2
+            return p if k & 1 else self.infinity()
+
+        x_2 = x.square()
+        x1, z1 = x, self.a.field.one
+        x2, z2 = x_2.square() + b, x_2
+        for ki in bin(k)[3:]:
+            t1 = x1 * z2
+            t2 = x2 * z1
+            z = (t1 + t2).square()
+            if ki == '1':
+                # (P1, P2) <- (P1 + P2, 2 P2)
+                x1, z1 = x * z + t1 * t2, z
+                t = x2.square()
+                z_2 = z2.square()
+                x2, z2 = t.square() + b * z_2.square(), t * z_2
+            else:
+                # (P1, P2) <- (2 P1, P1 + P2)
+                x2, z2 = x * z + t1 * t2, z
+                t = x1.square()
+                z_2 = z1.square()
+                x1, z1 = t.square() + b * z_2.square(), t * z_2
+
+        if z1 == 0:
+            return self.infinity()
+        if z2 == 0:
+            # (k + 1) P es el infinito
+            return self.negate(p)
+        # y3 = (x + x3)[(X1 + x Z1)(X2 + x Z2) + (x^2 + y) Z1 Z2]
+        #      / (x Z1 Z2) + y
+        z1z2 = z1 * z2
+        inv = (x * z1z2).inverse()
+        x3 = x1 * x * z2 * inv
+        t = (x1 + x * z1) * (x2 + x * z2) + (x_2 + y) * z1z2
+        y3 = (x + x3) * t * inv + y
+        return AffinePoint(x3, y3)
+
+    def halve(self, p: AffinePoint) -> AffinePoint:
+        """
+        Calcula el punto Q con 2Q = P dentro del subgrupo de orden impar.
+        Algorithm 3.81
+
+        Solo necesita resolver una ecuación z^2 + z = c, una raíz cuadrada,
+        una traza y dos multiplicaciones, frente a la inversión del doblado
+        afín. Requiere Tr(a) = 1, de modo que el cofactor sea 2.
+        """
         if p.is_inf():
-            return LDPointChar2(F2m(3, 1), F2m(3, 1), F2m(3, 0))
-        t1 = p.z * p.z
-        t2 = p.z * p.x
+            return p
+        x = p.x
+        lmd = (x + self.a).solve_quadratic()
+        if lmd is None:
+            raise ValueError('El punto no se puede dividir entre 2')
+        t = p.y + x * lmd
+        if t.trace() == 0:
+            u = (t + x).sqrt()
+        else:
+            lmd = lmd + self.a.field.one
+            u = t.sqrt()
+        # lambda_Q = u + v / u
+        return AffinePoint(u, u * (u + lmd))
+
+    def scalar_mul_halving(
+        self,
+        k: int,
+        p: AffinePoint,
+        w: Optional[int] = None,
+    ) -> AffinePoint:
+        """
+        Calcula kP con el método de dividir entre 2 y sumar. Algorithm 3.91
+
+        Con t = log2(n) se toma k' = 2^t k mod n, de forma que
+        k = sum k'_i / 2^(t - i) mod n, y se evalúa esa expresión de derecha
+        a izquierda sobre la wNAF de k', sustituyendo cada doblado por una
+        división entre 2. P debe estar en el subgrupo de orden n; si no lo
+        está se lanza :class:`InvalidPoint`.
+        """
+        if self.a.trace() != 1:
+            raise ValueError('La división entre 2 necesita Tr(a) = 1')
+        if p is not self.base:
+            self.validate(p)
+            if not self.in_subgroup(p):
+                raise InvalidPoint(p)
+        w = w or self.window
+        if k < 0:
+            k, p = -k, self.negate(p)
+        n = self.order
+        t = n.bit_length()
+        k %= n
+        if k == 0 or p.is_inf():
+            return self.infinity()
+        positives, negatives = self.odd_multiples(p, w)
+        digits = wnaf((k << t) % n, w)
+        digits += [0] * (t + 1 - len(digits))
+        halve, add = self.halve, self.unchecked_add
+        q = self.infinity()
+        for d in digits[:t]:
+            if d > 0:
+                q = add(q, positives[d >> 1])
+            elif d < 0:
+                q = add(q, negatives[-d >> 1])
+            q = halve(q)
+        d = digits[t]
+        if d > 0:
+            q = add(q, positives[d >> 1])
+        elif d < 0:
+            q = add(q, negatives[-d >> 1])
+        return q
+
+    def is_koblitz(self) -> bool:
+        """
+        Indica si la curva es de Koblitz, es decir, si a es 0 o 1 y b = 1.
+        En ese caso la curva está definida sobre F_2 y el endomorfismo de
+        Frobenius (x, y) -> (x^2, y^2) sustituye a los doblados.
+        """
+        return self.b == 1 and (self.a == 0 or self.a == 1)
+
+    def prefers_base_table(self) -> bool:
+        # En curvas de Koblitz la tau-NAF es tan rápida como la base fija
+        return not self.is_koblitz()
+
+    def frobenius(self, p: AffinePoint) -> AffinePoint:
+        """Aplica el endomorfismo de Frobenius tau(x, y) = (x^2, y^2)"""
+        if p.x is None:
+            return p
+        return AffinePoint(p.x.square(), p.y.square())
+
+    def ld_frobenius(self, p: LDPointChar2) -> LDPointChar2:
+        """Frobenius en coordenadas de López-Dahab: (X^2 : Y^2 : Z^2)"""
+        return LDPointChar2(p.x.square(), p.y.square(), p.z.square())
+
+    def koblitz_divisor(self, subgroup: bool) -> TauElement:
+        """
+        Elemento de Z[tau] respecto al que se reducen los escalares. Si el
+        punto está en el subgrupo de orden primo se usa
+        delta = (tau^m - 1) / (tau - 1), que lo anula; en otro caso se usa
+        tau^m - 1, que anula a todos los puntos de la curva.
+        """
+        divisor = self.tau_divisors.get(subgroup)
+        if divisor is None:
+            mu = self.koblitz_mu()
+            t0, t1 = tau_power(self.a.field.m, mu)
+            divisor = (t0 - 1, t1)
+            if subgroup:
+                divisor = tau_exact_div(divisor, (-1, 1), mu)
+            self.tau_divisors[subgroup] = divisor
+        return divisor
+
+    def koblitz_mu(self) -> int:
+        """mu = (-1)^(1 - a), de forma que tau^2 = mu tau - 2"""
+        return 1 if self.a == 1 else -1
+
+    def tnaf_multiples(
+        self,
+        p: AffinePoint,
+        w: int,
+    ) -> Tuple[List[AffinePoint], List[AffinePoint]]:
+        """
+        Devuelve los puntos alpha_u P = beta_u P + gamma_u tau(P) para
+        u = 1, 3, ..., 2^(w-1) - 1 y sus opuestos.
+        """
+        key = (p.x.n, p.y.n, 'tnaf', w)
+        table = self.multiples.get(key)
+        if table is None:
+            _, alphas = tnaf_constants(w, self.koblitz_mu())
+            tau_p = self.frobenius(p)
+            terms = []
+            for u in sorted(alphas):
+                beta, gamma = alphas[u]
+                terms.append(self._small_mul(beta, p))
+                terms.append(self._small_mul(gamma, tau_p))
+            terms = self.normalize_batch(terms)
+            positives = self.add_batch(list(zip(terms[::2], terms[1::2])))
+            table = (positives, [self.negate(q) for q in positives])
+            self.multiples[key] = table
+        return table
+
+    def multiples_table(
+        self,
+        p: AffinePoint,
+        w: Optional[int] = None,
+    ) -> Tuple[Hashable, List[AffinePoint]]:
+        if not self.is_koblitz():
+            return super().multiples_table(p, w)
+        w = w or self.window
+        return (p.x.n, p.y.n, 'tnaf', w), self.tnaf_multiples(p, w)[0]
+
+    def _small_mul(self, k: int, p: AffinePoint) -> LDPointChar2:
+        if k < 0:
+            k, p = -k, self.negate(p)
+        return self._ld_scalar_mul(k, p)
+
+    def scalar_mul_tnaf(
+        self,
+        k: int,
+        p: AffinePoint,
+        w: Optional[int] = None,
+        subgroup: Optional[bool] = None,
+    ) -> AffinePoint:
+        """
+        Calcula kP en curvas de Koblitz usando la tau-NAF de anchura w.
+        Algorithm 3.70
+
+        El escalar se reduce primero en Z[tau]; si ``subgroup`` es cierto
+        (por defecto, si P es el punto base) se reduce módulo
+        (tau^m - 1) / (tau - 1). Después cada doblado del método wNAF se
+        sustituye por el endomorfismo de Frobenius, que solo cuesta tres
+        cuadrados en coordenadas de López-Dahab.
+        """
+        if not self.is_koblitz():
+            raise ValueError('La curva no es de Koblitz')
+        if p is not self.base:
+            self.validate(p)
+        return self.to_affine(self._tnaf_mul(k, p, w, subgroup))
+
+    def _tnaf_mul(
+        self,
+        k: int,
+        p: AffinePoint,
+        w: Optional[int] = None,
+        subgroup: Optional[bool] = None,
+    ) -> LDPointChar2:
+        w = w or self.window
+        if subgroup is None:
+            subgroup = p is self.base
+        if k == 0 or p.is_inf():
+            return self.ld_infinity()
+        mu = self.koblitz_mu()
+        rho = tau_mod((k, 0), self.koblitz_divisor(subgroup), mu)
+        positives, negatives = self.tnaf_multiples(p, w)
+        frobenius, add = self.ld_frobenius, self.ld_add_mixed
+        q = self.ld_infinity()
+        for d in reversed(wtnaf(rho, w, mu)):
+            q = frobenius(q)
+            if d > 0:
+                q = add(q, positives[d >> 1])
+            elif d < 0:
+                q = add(q, negatives[-d >> 1])
+        return q
+
+    def lift(self, p: AffinePoint) -> LDPointChar2:
+        return self.to_ld(p)
+
+    def projective_double(self, p: LDPointChar2) -> LDPointChar2:
+        return self.ld_double(p)
+
+    def projective_add(self, p: LDPointChar2, q: AffinePoint) -> LDPointChar2:
+        return self.ld_add_mixed(p, q)
+
+    def projective_sum(self, p: LDPointChar2, q: LDPointChar2) -> LDPointChar2:
+        return self.ld_add(p, q)
+
+    def normalize(self, p: LDPointChar2) -> AffinePoint:
+        return self.to_affine(p)
+
+    def normalize_batch(
+        self,
+        points: Sequence[LDPointChar2],
+    ) -> List[AffinePoint]:
+        """
+        Pasa a coordenadas afines una lista de puntos de López-Dahab con una
+        única inversión: los Z se invierten a la vez con
+        :func:`~ycurve.ffields.ffield.batch_inverse`, y cada punto cuesta
+        después tres multiplicaciones y un cuadrado.
+        """
+        inverses = iter(batch_inverse([p.z for p in points if p.z.n > 1]))
+        result = []
+        for p in points:
+            if p.z.n > 1:
+                z_inv = next(inverses)
+                result.append(AffinePoint(p.x * z_inv, p.y * z_inv.square()))
+            else:
+                result.append(self.to_affine(p))
+        return result
+
+    def add_batch(
+        self,
+        pairs: Sequence[Tuple[AffinePoint, AffinePoint]],
+    ) -> List[AffinePoint]:
+        """
+        Calcula P + Q en coordenadas afines para cada pareja compartiendo una
+        única inversión entre todas (inversión simultánea). Si P = Q se
+        dobla el punto. Pensado para construir tablas de precálculo, donde
+        las sumas son independientes entre sí.
+        """
+        result: List[Optional[AffinePoint]] = [None] * len(pairs)
+        pending, denominators = [], []
+        for i, (p, q) in enumerate(pairs):
+            if p.x is None:
+                result[i] = q
+            elif q.x is None:
+                result[i] = p
+            elif p.x == q.x and (p.y != q.y or p.x == 0):
+                # Q = -P
+                result[i] = self.infinity()
+            else:
+                pending.append(i)
+                denominators.append(p.x if p.x == q.x else p.x + q.x)
+
+        for i, inv in zip(pending, batch_inverse(denominators)):
+            p, q = pairs[i]
+            if p.x == q.x:
+                lmd = p.x + p.y * inv
+                x3 = lmd.square() + lmd + self.a
+                y3 = p.x.square() + x3 * lmd + x3
+            else:
+                lmd = (p.y + q.y) * inv
+                x3 = lmd.square() + lmd + p.x + q.x + self.a
+                y3 = lmd * (p.x + x3) + x3 + p.y
+            result[i] = AffinePoint(x3, y3)
+        return result
+
+    def ld_infinity(self) -> LDPointChar2:
+        """Punto del infinito en coordenadas de López-Dahab: (1 : 0 : 0)"""
+        field = self.a.field
+        return LDPointChar2(field.one, field.zero, field.zero)
+
+    def to_ld(self, p: AffinePoint) -> LDPointChar2:
+        """Pasa un punto afín (x, y) a López-Dahab (x : y : 1)"""
+        if p.x is None:
+            return self.ld_infinity()
+        return LDPointChar2(p.x, p.y, self.a.field.one)
+
+    def to_affine(self, p: LDPointChar2) -> AffinePoint:
+        """
+        Pasa un punto (X : Y : Z) a coordenadas afines (X/Z, Y/Z^2). Necesita
+        una inversión.
+        """
+        if p.z == 0:
+            return AffinePoint(None, self.a.field.zero)
+        if p.z == 1:
+            return AffinePoint(p.x, p.y)
+        z_inv = p.z.inverse()
+        return AffinePoint(p.x * z_inv, p.y * z_inv.square())
+
+    def ld_double(self, p: LDPointChar2) -> LDPointChar2:
+        """Calcula 2P en coordenadas de López-Dahab. Algorithm 3.24"""
+        if p.z == 0:
+            return self.ld_infinity()
+        t1 = p.z.square()
+        t2 = p.x.square()
         z3 = t1 * t2
-        x3 = t2 * t2
-        t1 = t1 * t1
+        x3 = t2.square()
+        t1 = t1.square()
         t2 = t1 * self.b
         x3 = x3 + t2
-        t1 = p.y * p.y
+        t1 = p.y.square()
         if self.a == 1:
             t1 = t1 + z3
+        elif self.a != 0:
+            t1 = t1 + self.a * z3
         t1 = t1 + t2
         y3 = x3 * t1
         t1 = t2 * z3
         y3 = y3 + t1
         return LDPointChar2(x3, y3, z3)
 
-    def add(self, p: LDPointChar2, q: AffinePoint) -> LDPointChar2:
-        m = self.a.m
-        if q.is_inf():
+    def ld_add_mixed(self, p: LDPointChar2, q: AffinePoint) -> LDPointChar2:
+        """
+        Calcula P + Q con P en coordenadas de López-Dahab y Q en coordenadas
+        afines. Algorithm 3.25
+        """
+        if q.x is None:
             return p
-        if p.is_inf():
-            return LDPointChar2(q.x, q.y, 1)
+        if p.z == 0:
+            return self.to_ld(q)
         t1 = p.z * q.x
-        t2 = p.z * p.z
+        t2 = p.z.square()
         x3 = p.x + t1
         t1 = p.z * x3
         t3 = t2 * q.y
@@ -187,40 +1134,113 @@ class Char2Curve(Char2NonSupersingularCurve):
         if x3 == 0:
             if y3 == 0:
                 # case P == Q
-                return self.double(
-                    LDPointChar2(
-                        F2m(q.x.n, m),
-                        F2m(q.y.n, m),
-                        F2m(1, m)
-                    )
-                )
-            else:
-                # case P == -Q
-                return LDPointChar2(
-                    F2m(1, m),
-                    F2m(1, m),
-                    F2m(0, m),
-                )
-
-        z3 = t1 * t1
+                return self.ld_double(self.to_ld(q))
+            # case P == -Q
+            return self.ld_infinity()
+
+        z3 = t1.square()
         t3 = t1 * y3
         if self.a == 1:
             t1 = t1 + t2
-        t2 = x3 * x3
+        elif self.a != 0:
+            t1 = t1 + self.a * t2
+        t2 = x3.square()
         x3 = t2 * t1
-        t2 = y3 * y3
+        t2 = y3.square()
         x3 = x3 + t2
         x3 = x3 + t3
         t2 = q.x * z3
         t2 = t2 + x3
-        t1 = z3 * z3
-        t3 = t3 + t2
+        t1 = z3.square()
+        t3 = t3 + z3
         y3 = t3 * t2
         t2 = q.x + q.y
         t3 = t1 * t2
         y3 = y3 + t3
         return LDPointChar2(x3, y3, z3)
 
+    def ld_add(self, p: LDPointChar2, q: LDPointChar2) -> LDPointChar2:
+        """
+        Calcula P + Q con ambos puntos en coordenadas de López-Dahab, sin
+        inversiones (fórmula de Al-Daoud, Mahmod, Rushdan y Kilicman).
+        """
+        if p.z == 0:
+            return q
+        if q.z == 0:
+            return p
+        if q.z == 1:
+            return self.ld_add_mixed(p, AffinePoint(q.x, q.y))
+        if p.z == 1:
+            return self.ld_add_mixed(q, AffinePoint(p.x, p.y))
+        a = p.x * q.z
+        b = q.x * p.z
+        c = a.square()
+        d = b.square()
+        e = a + b
+        f = c + d
+        g = p.y * q.z.square()
+        h = q.y * p.z.square()
+        if e == 0:
+            if g == h:
+                return self.ld_double(p)
+            return self.ld_infinity()
+        i = g + h
+        j = i * e
+        z3 = f * p.z * q.z
+        x3 = a * (h + d) + b * (c + g)
+        y3 = (a * j + f * g) * f + (j + z3) * x3
+        return LDPointChar2(x3, y3, z3)
+
+    def scalar_mul_ld(self, k: int, p: Point) -> AffinePoint:
+        """
+        Calcula kP manteniendo todos los puntos intermedios en coordenadas
+        de López-Dahab, de forma que solo se hace una inversión al final
+        para volver a coordenadas afines.
+        """
+        if p is not self.base:
+            self.validate(p)
+        if isinstance(p, LDPointChar2):
+            if p.z == 0 or p.z == 1:
+                p = self.to_affine(p)
+        return self.to_affine(self._ld_scalar_mul(k, p))
+
+    def _ld_scalar_mul(self, k: int, p: Point) -> LDPointChar2:
+        if isinstance(p, AffinePoint):
+            add = self.ld_add_mixed
+        else:
+            add = self.ld_add
+        output = self.ld_infinity()
+        for ki in bin(k)[2:]:
+            output = self.ld_double(output)
+            if ki == '1':
+                output = add(output, p)
+        return output
+
+
+class Char2Curve(Char2NonSupersingularCurve):
+    """
+    Curvas no supersingulares de la forma y^2 + xy = x^3 + ax^2 + b
+    con coordenadas de Lopez Dahab
+
+    Las operaciones ``double`` y ``add`` trabajan con puntos
+    :class:`LDPointChar2`, mientras que ``scalar_mul`` acepta puntos en
+    cualquiera de las dos representaciones y devuelve un
+    :class:`AffinePoint`.
+
+    :ivar a: Coeficiente a de la ecuación
+    :ivar b: Coeficiente b de la ecuación
+    """
+
+    def double(self, p: LDPointChar2) -> LDPointChar2:
+        return self.ld_double(p)
+
+    def add(self, p: Point, q: Point) -> LDPointChar2:
+        if isinstance(p, AffinePoint):
+            p = self.to_ld(p)
+        if isinstance(q, LDPointChar2):
+            return self.ld_add(p, q)
+        return self.ld_add_mixed(p, q)
+
 
 class Char2SupersingularCurve(Curve):
     """
@@ -232,10 +1252,17 @@ class Char2SupersingularCurve(Curve):
     """
 
     def __init__(self, a: F2m, b: F2m, c: F2m):
+        super().__init__()
         self.a = a
         self.b = b
         self.c = c
 
+    def negate(self, p: AffinePoint) -> AffinePoint:
+        """-(x, y) = (x, y + c)"""
+        if p.x is None:
+            return p
+        return AffinePoint(p.x, p.y + self.c)
+
     def add(self, p: AffinePoint, q: AffinePoint) -> AffinePoint:
         if p.x is None:
             return q
@@ -245,7 +1272,7 @@ class Char2SupersingularCurve(Curve):
         x_12 = p.x + q.x
         t0 = x_12.inverse()
         t1 = y_12 * t0
-        t2 = t1 * t1
+        t2 = t1.square()
         x3 = t2 + x_12
         x_31 = p.x + x3
         y3_pre = t1 * x_31
@@ -259,11 +1286,11 @@ class Char2SupersingularCurve(Curve):
             raise ZeroDivisionError
         elif p.x is None:
             return p
-        x_11 = p.x * p.x
+        x_11 = p.x.square()
         c_m1 = self.c.inverse()
         x_1a = x_11 + self.a
         t0 = x_1a * c_m1
-        x3 = t0 * t0
+        x3 = t0.square()
         x_13 = p.x + x3
         y3_pre = t0 * x_13
         t1 = p.y + self.c
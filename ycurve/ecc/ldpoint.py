@@ -2,6 +2,10 @@ from ycurve.ecc.point import Point, PointCoordinates, AffinePoint
 
 
 class LDPointChar2(Point):
+    """
+    Punto en coordenadas de López-Dahab (X : Y : Z), que representa al punto
+    afín (X/Z, Y/Z^2). Los puntos con Z = 0 representan al infinito.
+    """
 
     def __init__(
         self,
@@ -15,25 +19,29 @@ class LDPointChar2(Point):
 
     def __eq__(self, q: object) -> bool:
         if isinstance(q, AffinePoint):
+            if q.x is None:
+                return self.z == 0
             return (
-                self.x == q.x and
-                self.y == q.y and
-                self.z == 1
+                self.z != 0 and
+                self.x == q.x * self.z and
+                self.y == q.y * self.z.square()
             )
         elif not isinstance(q, LDPointChar2):
             raise NotImplementedError()
 
+        if self.z == 0 or q.z == 0:
+            return self.z == q.z
+        # (X1 : Y1 : Z1) = (X2 : Y2 : Z2) <=> X1 Z2 = X2 Z1, Y1 Z2^2 = Y2 Z1^2
         return (
-            self.x == q.x and
-            self.y == q.y and
-            self.z == q.z
+            self.x * q.z == q.x * self.z and
+            self.y * q.z.square() == q.y * self.z.square()
         )
 
     def __str__(self):
         return f'({self.x}, {self.y}, {self.z})'
 
     def is_inf(self):
-        return self.x == 1 and self.y == 0 and self.z == 0
+        return self.z == 0
 
     def is_base(self) -> bool:
         return any([a is None for a in [self.x, self.y, self.z]])
@@ -32,11 +32,25 @@ class AffinePoint(Point):
         return self.x == other.x and self.y == other.y
 
     def is_inf(self):
-        return None
+        return self.x is None
 
     def base_point(self):
         return None
 
+    def to_bytes(self, compressed: bool = False) -> bytes:
+        """
+        Codifica el punto según SEC 1, sección 2.3.3. El infinito es el byte
+        0x00; sin comprimir se usa 0x04 || x || y y comprimido
+        0x02 o 0x03 || x, donde el bit bajo del prefijo es el bit menos
+        significativo de y / x (0 si x = 0).
+        """
+        if self.x is None:
+            return b'\x00'
+        if not compressed:
+            return b'\x04' + self.x.to_bytes() + self.y.to_bytes()
+        y_bit = 0 if self.x == 0 else (self.y * self.x.inverse()).n & 1
+        return bytes((2 | y_bit,)) + self.x.to_bytes()
+
     def __str__(self):
         if isinstance(self.x, F2m):
             x, y = self.x.n, self.y.n
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""Almacenamiento de precálculos para la multiplicación escalar
+
+Además de las cachés en memoria, las tablas de una curva (la de base fija y
+las de múltiplos de puntos como llaves públicas) se pueden guardar en un
+fichero con :func:`save_tables` y cargar con :func:`load_tables`. El
+fichero se proyecta en memoria con ``mmap`` y los puntos se decodifican
+cuando se usan, así que cargarlo es casi inmediato y los procesos que lo
+abren comparten sus páginas a través de la caché del sistema operativo.
+
+Formato (todos los enteros en little-endian):
+
+    * Cabecera: ``b'YCTB'``, versión (u16), m (u16), bytes por coordenada
+      w = ceil(m / 8) (u16), huella SHA-256 de los parámetros de la curva
+      (32 bytes), SHA-256 de todo lo que sigue a la cabecera (32 bytes) y
+      número de secciones (u32).
+    * Cada sección: tipo (u8: 0 base fija, 1 wNAF, 2 tau-NAF), anchura de
+      ventana (u8), número de puntos (u32), coordenadas x e y del punto al
+      que corresponde la tabla (w bytes cada una) y los puntos de la tabla
+      como pares x || y de w bytes cada uno.
+"""
+from collections import OrderedDict
+from collections import abc
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from ycurve.ecc.point import AffinePoint
+from ycurve.ffields.ffield import GF2m, get_field
+
+
+class LRUCache:
+    """
+    Diccionario de tamaño acotado. Cuando se llena se descarta la entrada
+    que lleva más tiempo sin usarse. Las curvas del registro se comparten
+    entre hilos, así que los accesos se protegen con un cerrojo.
+
+    :ivar maxsize: Número máximo de entradas.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'maxsize': self.maxsize, '_data': self._data.copy()}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class FixedBaseTable:
+    """
+    Tabla de precálculo del método de ventana de base fija para un punto P:
+    ``points[i] = 2^(w i) P`` para ``0 <= i < d``.
+
+    :ivar window: Anchura de ventana w.
+    :ivar points: Puntos en coordenadas afines.
+    """
+
+    def __init__(self, window: int, points: Sequence[AffinePoint]):
+        self.window = window
+        self.points = points
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @property
+    def max_bits(self) -> int:
+        """Número de bits del mayor escalar que admite la tabla"""
+        return self.window * len(self.points)
+
+
+MAGIC = b'YCTB'
+VERSION = 2
+# Firma, versión, m, bytes por coordenada, huella de la curva, SHA-256 del
+# contenido y número de tablas
+HEADER = struct.Struct('<4sHHH32s32sI')
+SECTION = struct.Struct('<BBI')
+KIND_BASE, KIND_WNAF, KIND_TNAF = 0, 1, 2
+
+# Proyecciones abiertas por ruta, compartidas por todas las tablas de un
+# mismo fichero dentro del proceso
+_maps: Dict[str, mmap.mmap] = {}
+# SHA-256 del contenido de cada proyección, ya comprobado
+_digests: Dict[str, bytes] = {}
+
+
+def _open_map(path: str) -> mmap.mmap:
+    data = _maps.get(path)
+    if data is None:
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _maps[path] = data
+    return data
+
+
+def _verified_map(path: str) -> Tuple[mmap.mmap, bytes]:
+    """
+    Proyecta el fichero y devuelve la proyección y el SHA-256 de su
+    contenido. El contenido se comprueba contra la cabecera la primera vez
+    que se proyecta en el proceso.
+    """
+    data = _open_map(path)
+    digest = _digests.get(path)
+    if digest is None:
+        if len(data) < HEADER.size:
+            raise ValueError('El fichero no es una tabla de ycurve compatible')
+        magic, version, _, _, _, digest, _ = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('El fichero no es una tabla de ycurve compatible')
+        with memoryview(data) as view:
+            if hashlib.sha256(view[HEADER.size:]).digest() != digest:
+                raise ValueError('El fichero de tablas está dañado')
+        _digests[path] = digest
+    return data, digest
+
+
+class MappedPoints(abc.Sequence):
+    """
+    Lista de solo lectura de puntos guardados en un fichero proyectado en
+    memoria. Cada punto se decodifica la primera vez que se accede a él.
+    Al serializarse con ``pickle`` solo se envía la ruta, la posición y el
+    SHA-256 del contenido, de modo que otro proceso vuelve a proyectar el
+    mismo fichero y comprueba que no ha cambiado.
+
+    :ivar path: Ruta del fichero.
+    :ivar offset: Posición del primer punto.
+    :ivar width: Bytes por coordenada.
+    :ivar field: Cuerpo de las coordenadas.
+    :ivar digest: SHA-256 del contenido del fichero del que se leyó la
+        tabla.
+
+    :raises ValueError: Si el fichero está dañado o su contenido ya no es
+        el de ``digest``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        count: int,
+        width: int,
+        field: GF2m,
+        digest: bytes,
+    ):
+        self.path = path
+        self.offset = offset
+        self.width = width
+        self.field = field
+        self.digest = digest
+        self._data, current = _verified_map(path)
+        if current != digest:
+            raise ValueError('El fichero de tablas ha cambiado')
+        self._points: List[Optional[AffinePoint]] = [None] * count
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        p = self._points[i]
+        if p is None:
+            w = self.width
+            start = self.offset + 2 * w * (i % len(self))
+            x = int.from_bytes(self._data[start:start + w], 'little')
+            y = int.from_bytes(self._data[start + w:start + 2 * w], 'little')
+            p = self._points[i] = AffinePoint(self.field(x), self.field(y))
+        return p
+
+    def __reduce__(self):
+        field = self.field
+        return (_mapped_points, (
+            self.path, self.offset, len(self), self.width,
+            field.m, field.generator, self.digest,
+        ))
+
+
+def _mapped_points(path, offset, count, width, m, generator, digest):
+    return MappedPoints(
+        path, offset, count, width, get_field(m, generator), digest,
+    )
+
+
+def curve_fingerprint(curve: Any) -> bytes:
+    """Huella SHA-256 de los parámetros de la curva y su punto base"""
+    field = curve.a.field
+    width = (field.m + 8) // 8
+    values = [field.generator, curve.a.n, curve.b.n]
+    if curve.base is not None:
+        values += [curve.base.x.n, curve.base.y.n]
+    return hashlib.sha256(
+        b''.join(v.to_bytes(width, 'little') for v in values)
+    ).digest()
+
+
+def _encode_points(points: Sequence[AffinePoint], width: int) -> bytes:
+    out = bytearray()
+    for p in points:
+        if p.is_inf():
+            raise ValueError('Las tablas no pueden contener el infinito')
+        out += p.x.n.to_bytes(width, 'little')
+        out += p.y.n.to_bytes(width, 'little')
+    return bytes(out)
+
+
+def save_tables(
+    curve: Any,
+    path: str,
+    points: Sequence[AffinePoint] = (),
+    w: Optional[int] = None,
+):
+    """
+    Guarda en ``path`` la tabla de base fija de la curva, si la usa, y las
+    tablas de múltiplos de ``points``, construyéndolas si hace falta. Si la
+    curva no usa tabla de base fija se guarda la de múltiplos del punto
+    base.
+
+    :ivar curve: Curva binaria con punto base.
+    :ivar points: Puntos, por ejemplo llaves públicas, cuyas tablas se
+        guardan.
+    :ivar w: Anchura de ventana de las tablas de múltiplos.
+    """
+    field = curve.a.field
+    width = field.byte_length
+    sections = []
+    points = list(points)
+    if curve.base_table is None and curve.prefers_base_table():
+        curve.precompute_base()
+    if curve.base_table is not None:
+        table = curve.base_table
+        sections.append(
+            (KIND_BASE, table.window, curve.base, list(table.points))
+        )
+    elif curve.base is not None:
+        points.insert(0, curve.base)
+    for p in points:
+        key, positives = curve.multiples_table(p, w)
+        kind = KIND_TNAF if 'tnaf' in key else KIND_WNAF
+        sections.append((kind, key[-1], p, list(positives)))
+
+    # Se escribe en un fichero nuevo y se renombra para no alterar las
+    # proyecciones que otros procesos tengan abiertas
+    body = bytearray()
+    for kind, window, p, table in sections:
+        body += SECTION.pack(kind, window, len(table))
+        body += _encode_points([p], width)
+        body += _encode_points(table, width)
+
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(
+            MAGIC, VERSION, field.m, width, curve_fingerprint(curve),
+            hashlib.sha256(body).digest(), len(sections),
+        ))
+        f.write(body)
+    os.replace(tmp, path)
+    _maps.pop(path, None)
+    _digests.pop(path, None)
+
+
+def load_tables(curve: Any, path: str) -> int:
+    """
+    Proyecta en memoria un fichero creado con :func:`save_tables` e instala
+    sus tablas en la curva. Devuelve el número de tablas cargadas.
+
+    El contenido se comprueba con su SHA-256 antes de instalar nada, ya que
+    los puntos de las tablas no se vuelven a validar.
+
+    :raises ValueError: Si el fichero no tiene el formato esperado, es de
+        otra curva o está dañado.
+    """
+    data, digest = _verified_map(path)
+    field = curve.a.field
+    _, _, m, width, fingerprint, _, count = HEADER.unpack_from(data)
+    if m != field.m or width != field.byte_length or (
+        fingerprint != curve_fingerprint(curve)
+    ):
+        raise ValueError('Las tablas son de otra curva')
+
+    offset = HEADER.size
+    for _ in range(count):
+        kind, window, size = SECTION.unpack_from(data, offset)
+        offset += SECTION.size
+        p = MappedPoints(path, offset, 1, width, field, digest)[0]
+        offset += 2 * width
+        table = MappedPoints(path, offset, size, width, field, digest)
+        offset += 2 * width * size
+        if kind == KIND_BASE:
+            curve.base_table = FixedBaseTable(window, table)
+            curve.lazy_base_table = False
+        else:
+            key: Tuple = (p.x.n, p.y.n, window)
+            if kind == KIND_TNAF:
+                key = (p.x.n, p.y.n, 'tnaf', window)
+            curve.install_multiples(key, table)
+    return count
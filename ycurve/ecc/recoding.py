@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Representaciones de escalares para la multiplicación escalar
+
+Las funciones de este módulo devuelven los dígitos empezando por el menos
+significativo, de modo que ``k = sum(d * 2**i for i, d in enumerate(...))``.
+"""
+from typing import Dict, List, Tuple
+
+
+def mods(k: int, w: int) -> int:
+    """Resto de k módulo 2^w en el intervalo [-2^(w-1), 2^(w-1))"""
+    d = k & ((1 << w) - 1)
+    if d >= 1 << (w - 1):
+        d -= 1 << w
+    return d
+
+
+def wnaf(k: int, w: int) -> List[int]:
+    """
+    Forma no adyacente de anchura w de un entero positivo. Algorithm 3.35
+
+    Cada dígito no nulo es impar, con valor absoluto menor que 2^(w-1), y
+    entre dos dígitos no nulos hay al menos w - 1 ceros.
+    """
+    digits = []
+    while k > 0:
+        if k & 1:
+            d = mods(k, w)
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+
+def naf(k: int) -> List[int]:
+    """Forma no adyacente de un entero positivo. Algorithm 3.30"""
+    return wnaf(k, 2)
+
+
+# Aritmética en Z[tau], con tau^2 = mu tau - 2 y mu = 1 o -1. Los elementos
+# r0 + r1 tau se representan con la tupla (r0, r1).
+
+TauElement = Tuple[int, int]
+
+
+def tau_mul(a: TauElement, b: TauElement, mu: int) -> TauElement:
+    """Producto en Z[tau]"""
+    a0, a1 = a
+    b0, b1 = b
+    return (a0 * b0 - 2 * a1 * b1, a0 * b1 + a1 * b0 + mu * a1 * b1)
+
+
+def tau_norm(a: TauElement, mu: int) -> int:
+    """Norma N(r0 + r1 tau) = r0^2 + mu r0 r1 + 2 r1^2"""
+    r0, r1 = a
+    return r0 * r0 + mu * r0 * r1 + 2 * r1 * r1
+
+
+def tau_conjugate(a: TauElement, mu: int) -> TauElement:
+    """Conjugado, usando que el conjugado de tau es mu - tau"""
+    r0, r1 = a
+    return (r0 + mu * r1, -r1)
+
+
+def tau_power(m: int, mu: int) -> TauElement:
+    """Calcula tau^m"""
+    result, base = (1, 0), (0, 1)
+    while m:
+        if m & 1:
+            result = tau_mul(result, base, mu)
+        base = tau_mul(base, base, mu)
+        m >>= 1
+    return result
+
+
+def tau_exact_div(a: TauElement, b: TauElement, mu: int) -> TauElement:
+    """Divide a entre b suponiendo que la división es exacta en Z[tau]"""
+    n = tau_norm(b, mu)
+    c0, c1 = tau_mul(a, tau_conjugate(b, mu), mu)
+    if c0 % n or c1 % n:
+        raise ValueError(f'{a} no es múltiplo de {b}')
+    return (c0 // n, c1 // n)
+
+
+def tau_round_div(a: TauElement, b: TauElement, mu: int) -> TauElement:
+    """
+    Cociente q de a entre b tal que a - q b tiene norma mínima. Se calcula
+    a / b = (l0 + l1 tau) con l_i racionales y se redondea. Algorithm 3.63
+    """
+    n = tau_norm(b, mu)
+    c0, c1 = tau_mul(a, tau_conjugate(b, mu), mu)
+    # l_i = c_i / n, f_i = round(l_i) y e_i = (l_i - f_i) n
+    f0, f1 = (2 * c0 + n) // (2 * n), (2 * c1 + n) // (2 * n)
+    e0, e1 = c0 - f0 * n, c1 - f1 * n
+    h0 = h1 = 0
+    eta = 2 * e0 + mu * e1
+    if eta >= n:
+        if e0 - 3 * mu * e1 < -n:
+            h1 = mu
+        else:
+            h0 = 1
+    elif e0 + 4 * mu * e1 >= 2 * n:
+        h1 = mu
+    if eta < -n:
+        if e0 - 3 * mu * e1 >= n:
+            h1 = -mu
+        else:
+            h0 = -1
+    elif e0 + 4 * mu * e1 < -2 * n:
+        h1 = -mu
+    return (f0 + h0, f1 + h1)
+
+
+def tau_mod(a: TauElement, b: TauElement, mu: int) -> TauElement:
+    """Resto de a módulo b con norma mínima"""
+    q = tau_round_div(a, b, mu)
+    qb0, qb1 = tau_mul(q, b, mu)
+    return (a[0] - qb0, a[1] - qb1)
+
+
+def lucas_u(k: int, mu: int) -> int:
+    """U_k con U_0 = 0, U_1 = 1 y U_(k+1) = mu U_k - 2 U_(k-1)"""
+    u0, u1 = 0, 1
+    for _ in range(k):
+        u0, u1 = u1, mu * u1 - 2 * u0
+    return u0
+
+
+def tnaf_constants(w: int, mu: int) -> Tuple[int, Dict[int, TauElement]]:
+    """
+    Constantes de la tau-NAF de anchura w: t_w = 2 U_(w-1) / U_w mod 2^w y
+    los representantes alpha_u = u mod tau^w para u = 1, 3, ..., 2^(w-1) - 1
+    """
+    modulus = 1 << w
+    t_w = 2 * lucas_u(w - 1, mu) * pow(lucas_u(w, mu), -1, modulus) % modulus
+    tau_w = tau_power(w, mu)
+    alphas = {
+        u: tau_mod((u, 0), tau_w, mu)
+        for u in range(1, 1 << (w - 1), 2)
+    }
+    return t_w, alphas
+
+
+def wtnaf(rho: TauElement, w: int, mu: int) -> List[int]:
+    """
+    tau-NAF de anchura w de rho = r0 + r1 tau. Algorithm 3.69
+
+    Cada dígito no nulo es un entero impar u con signo, que representa a
+    +-alpha_|u|, de modo que rho = sum(alpha_(d_i) tau^i).
+    """
+    t_w, alphas = tnaf_constants(w, mu)
+    r0, r1 = rho
+    digits = []
+    while r0 or r1:
+        if r0 & 1:
+            u = mods(r0 + r1 * t_w, w)
+            beta, gamma = alphas[abs(u)]
+            if u > 0:
+                r0, r1 = r0 - beta, r1 - gamma
+            else:
+                r0, r1 = r0 + beta, r1 + gamma
+        else:
+            u = 0
+        digits.append(u)
+        # rho / tau = r1 + mu r0 / 2 - (r0 / 2) tau
+        r0, r1 = r1 + mu * (r0 // 2), -(r0 // 2)
+    return digits
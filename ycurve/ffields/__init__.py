@@ -1 +1,6 @@
-from ycurve.ffields.ffield import F2m  # noqa: F401
+from ycurve.ffields.ffield import (  # noqa: F401
+    F2m,
+    GF2m,
+    batch_inverse,
+    get_field,
+)
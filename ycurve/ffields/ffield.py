@@ -19,9 +19,11 @@ Para trabjar con :class: F2m debe hacerse de la siguiente manera:
 # Implementation for finity fields
 from __future__ import annotations
 
-from functools import reduce
+from functools import lru_cache, partial, reduce
 import logging
-from typing import List, Tuple
+import random
+import timeit
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 from ycurve.errors import UnknownPrimitivePolynom
 
@@ -56,6 +58,268 @@ PRIMITIVE_CONWAY_POLS = {
 }
 
 
+# Por encima de este grado se divide la multiplicación mediante Karatsuba.
+# En CPython el coste de cada operación con enteros está dominado por el
+# intérprete y no por el tamaño, de modo que el método del peine es más
+# rápido para todos los cuerpos estándar (hasta m = 571 y más allá).
+KARATSUBA_THRESHOLD = 4096
+
+
+def _spread_byte(byte: int) -> bytes:
+    spread = 0
+    for i in range(8):
+        spread |= ((byte >> i) & 1) << (2 * i)
+    return spread.to_bytes(2, 'little')
+
+
+# Cuadrado de cada polinomio de grado menor que 8: basta intercalar ceros
+# entre sus bits, ya que en característica dos (sum a_i z^i)^2 = sum a_i z^2i
+SQUARE_TABLE = [_spread_byte(byte) for byte in range(256)]
+
+
+class GF2m:
+    """
+    Contexto de un cuerpo F_2^m. Guarda los datos que son comunes a todos
+    los elementos del cuerpo para que se calculen una única vez: el grado,
+    el polinomio respecto al que se reduce y la rutina de reducción.
+
+    No se debe instanciar directamente sino mediante :func:`get_field`,
+    que devuelve siempre el mismo objeto para el mismo cuerpo::
+
+        >>> k = get_field(409, coefs_pos_to_int([409, 87, 0]))
+        >>> k(3) * k(5)
+        F[2**409](15)
+
+    :ivar m: Potencia del cuerpo.
+    :ivar generator: Polinomio respecto al que se realizan reducciones módulo.
+    :ivar mask: Máscara con los ``m`` bits menos significativos.
+    :ivar terms: Exponentes intermedios si el polinomio es disperso.
+    :ivar reduce: Función que reduce un entero módulo ``generator``.
+    :ivar window: Anchura de ventana usada en las multiplicaciones.
+    :ivar mul: Función que multiplica dos polinomios sin reducir.
+    :ivar inversion: Nombre del algoritmo de inversión, una de las claves de
+        ``INVERSION_METHODS``. Por defecto ``'euclid'``.
+    :ivar invert: Función de inversión asociada a ``inversion``.
+    :ivar byte_length: Número de bytes de un elemento codificado,
+        ``ceil(m / 8)``.
+    """
+
+    __slots__ = (
+        'm', 'generator', 'mask', 'terms', 'reduce', 'window', 'mul',
+        'inversion', 'invert', 'zero', 'one', 'byte_length', '_trace_mask',
+        '_half_trace_tables', '_sqrt_z', '_compress_masks',
+    )
+
+    def __init__(self, m: int, gen: Optional[int] = None):
+        if not gen:
+            try:
+                gen = coefs_to_int(PRIMITIVE_CONWAY_POLS[m])
+            except KeyError as e:
+                raise UnknownPrimitivePolynom() from e
+        self.m = m
+        self.generator = gen
+        self.mask = (1 << m) - 1
+        self.byte_length = (m + 7) // 8
+        self.terms = reduction_terms(gen)
+        self.reduce = reduction_for(gen)
+        self.window = 4 if m < 256 else 5
+        if m > KARATSUBA_THRESHOLD:
+            self.mul = partial(karatsuba_mul, bits=m, w=self.window)
+        else:
+            self.mul = partial(comb_mul, w=self.window)
+        self.set_inversion('euclid')
+        self.zero = self(0)
+        self.one = self(1)
+        # Tablas para traza, semitraza y raíces cuadradas; se construyen la
+        # primera vez que se usan
+        self._trace_mask: Optional[int] = None
+        self._half_trace_tables: Optional[List[List[int]]] = None
+        self._sqrt_z: Optional[int] = None
+        self._compress_masks: Optional[List[Tuple[int, int]]] = None
+
+    def __call__(self, n: int) -> F2m:
+        """Crea el elemento del cuerpo representado por el entero ``n``"""
+        element = object.__new__(F2m)
+        element.n = n
+        element.field = self
+        return element
+
+    def from_bytes(self, data: bytes) -> F2m:
+        """
+        Decodifica un elemento a partir de ``byte_length`` bytes en orden
+        big-endian (SEC 1, sección 2.3.6). Acepta cualquier objeto tipo
+        bytes, incluidas vistas de memoria, sin copiarlo.
+        """
+        if len(data) != self.byte_length:
+            raise ValueError(
+                f'Se esperaban {self.byte_length} bytes y hay {len(data)}'
+            )
+        n = int.from_bytes(data, 'big')
+        if n >> self.m:
+            raise ValueError('El valor no pertenece al cuerpo')
+        return self(n)
+
+    def set_inversion(self, name: str):
+        """Elige el algoritmo de inversión usado por los elementos"""
+        self.invert = INVERSION_METHODS[name]
+        self.inversion = name
+
+    def trace(self, n: int) -> int:
+        """
+        Traza Tr(c) = c + c^2 + ... + c^(2^(m-1)), que vale 0 o 1. Es lineal,
+        así que basta con la paridad de los bits de ``c`` en las posiciones i
+        con Tr(z^i) = 1.
+        """
+        mask = self._trace_mask
+        if mask is None:
+            mask = self._trace_mask = self._build_trace_mask()
+        return bin(n & mask).count('1') & 1
+
+    def _build_trace_mask(self) -> int:
+        # Tr(z^k) es la suma de las potencias k-ésimas de las raíces de f,
+        # que se obtienen con las identidades de Newton
+        m, f = self.m, self.generator
+        coefs = [j for j in range(1, m + 1) if (f >> (m - j)) & 1]
+        traces = [m & 1]
+        for k in range(1, m):
+            t = k & (f >> (m - k)) & 1
+            for j in coefs:
+                if j >= k:
+                    break
+                t ^= traces[k - j]
+            traces.append(t)
+        return sum(1 << i for i, t in enumerate(traces) if t)
+
+    def half_trace(self, n: int) -> int:
+        """
+        Semitraza H(c) = sum c^(2^(2i)) para i = 0, ..., (m - 1) / 2. Solo
+        está definida para m impar y cumple H(c)^2 + H(c) = c + Tr(c).
+        """
+        if not self.m & 1:
+            raise ValueError('La semitraza solo existe para m impar')
+        return self._apply_half_trace(n)
+
+    def solve_quadratic(self, n: int) -> Optional[int]:
+        """
+        Devuelve una solución z de z^2 + z = c, o ``None`` si no existe, lo
+        que ocurre si y solo si Tr(c) = 1. La otra solución es z + 1.
+        """
+        if self.trace(n):
+            return None
+        return self._apply_half_trace(n)
+
+    def _apply_half_trace(self, n: int) -> int:
+        tables = self._half_trace_tables
+        if tables is None:
+            tables = self._half_trace_tables = self._build_half_trace()
+        result = 0
+        for table, byte in zip(tables, n.to_bytes(len(tables), 'little')):
+            result ^= table[byte]
+        return result
+
+    def _build_half_trace(self) -> List[List[int]]:
+        """
+        Construye tablas por bytes de una aplicación lineal S con
+        S(c)^2 + S(c) = c + Tr(c) w, donde w es un elemento fijo de traza 1
+        (w = 1 si m es impar). Para ello se resuelve L(s) = s^2 + s para
+        la base z^i mediante eliminación gaussiana. Si m es impar se elige
+        en cada caso la solución con la misma traza que H(z^i), de modo que
+        S coincide con la semitraza.
+        """
+        m = self.m
+        pivots: Dict[int, Tuple[int, int]] = {}
+        for j in range(m):
+            value = self.reduce(square_without_reduction(1 << j)) ^ (1 << j)
+            preimage = 1 << j
+            while value:
+                top = value.bit_length() - 1
+                if top not in pivots:
+                    pivots[top] = (value, preimage)
+                    break
+                value ^= pivots[top][0]
+                preimage ^= pivots[top][1]
+
+        # Elemento de traza 1 que se suma a z^i cuando Tr(z^i) = 1 para que
+        # la ecuación tenga solución. Si m es impar vale 1.
+        self.trace(0)
+        mask = self._trace_mask
+        correction = mask & -mask
+        basis = []
+        for i in range(m):
+            t = self.trace(1 << i)
+            c, s = (1 << i) ^ (correction if t else 0), 0
+            while c:
+                value, preimage = pivots[c.bit_length() - 1]
+                c ^= value
+                s ^= preimage
+            # Tr(H(c)) = ((m + 1) / 2) Tr(c)
+            if m & 1 and self.trace(s) != ((m + 1) // 2) & t:
+                s ^= 1
+            basis.append(s)
+
+        tables = []
+        for j in range(0, m, 8):
+            table = [0] * 256
+            for byte in range(1, 256):
+                low = byte & -byte
+                i = j + low.bit_length() - 1
+                table[byte] = table[byte ^ low] ^ (basis[i] if i < m else 0)
+            tables.append(table)
+        return tables
+
+    def sqrt(self, n: int) -> int:
+        """
+        Raíz cuadrada. Separando los bits pares e impares de c se tiene
+        sqrt(c) = c_par(z) + sqrt(z) c_impar(z), donde c_par y c_impar se
+        obtienen compactando los bits correspondientes.
+        """
+        if self._sqrt_z is None:
+            root = 2
+            for _ in range(self.m - 1):
+                root = self.reduce(square_without_reduction(root))
+            self._sqrt_z = root
+            self._compress_masks = _compress_masks(self.m)
+        masks = self._compress_masks
+        even = _compress(n, masks)
+        odd = _compress(n >> 1, masks)
+        return even ^ self.reduce(self.mul(odd, self._sqrt_z))
+
+    def __eq__(self, k: object) -> bool:
+        if not isinstance(k, GF2m):
+            return NotImplemented
+        return self.m == k.m and self.generator == k.generator
+
+    def __hash__(self) -> int:
+        return hash((self.m, self.generator))
+
+    def __reduce__(self):
+        return (get_field, (self.m, self.generator))
+
+    def __str__(self) -> str:
+        return f'F[2**{self.m}]'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+_FIELDS: Dict[Tuple[int, Optional[int]], GF2m] = {}
+
+
+def get_field(m: int, gen: Optional[int] = None) -> GF2m:
+    """
+    Devuelve el contexto del cuerpo F_2^m con polinomio ``gen``. Si no se
+    indica polinomio se usa el de Conway. Los contextos se guardan de forma
+    que todas las llamadas con los mismos parámetros comparten objeto.
+    """
+    try:
+        return _FIELDS[(m, gen)]
+    except KeyError:
+        field = GF2m(m, gen)
+        field = _FIELDS.setdefault((m, field.generator), field)
+        _FIELDS[(m, gen)] = field
+        return field
+
+
 class F2m:
     """
     Representation de elementos en cuerpos de característica dos.
@@ -72,11 +336,16 @@ class F2m:
     tres en F_2^7. El polinomio que se utiliza para reducir es tomado de una
     lista precalculada.
 
+    Cada elemento solo guarda su valor y una referencia al contexto
+    :class:`GF2m` del cuerpo, que es compartido por todos los elementos.
+
     Adevertencia: Esta lista tiene polinomios hasta grado 21. Si se supera este
     grado el usuario está encargado de proveer a la clase con un polinomio
     irreduble válido.
     """
 
+    __slots__ = ('n', 'field')
+
     def __init__(self, n: int, m: int, gen: int = None):
         """
         :ivar n: Entero que representa al polinomio que se instancia.
@@ -84,14 +353,22 @@ class F2m:
         :ivar gen: Polinomio respecto al que se realizan reducciones módulo.
         """
         self.n = n
-        self.m = m
-        if gen:
-            self.generator = gen
-        else:
-            try:
-                self.generator = coefs_to_int(PRIMITIVE_CONWAY_POLS[m])
-            except KeyError as e:
-                raise UnknownPrimitivePolynom() from e
+        self.field = get_field(m, gen)
+
+    @property
+    def m(self) -> int:
+        return self.field.m
+
+    @property
+    def generator(self) -> int:
+        return self.field.generator
+
+    def __reduce__(self):
+        return (F2m, (self.n, self.field.m, self.field.generator))
+
+    def to_bytes(self) -> bytes:
+        """Codifica el elemento en ``ceil(m / 8)`` bytes big-endian"""
+        return self.n.to_bytes(self.field.byte_length, 'big')
 
     def __str__(self) -> str:
         return f'F[2**{self.m}]({self.n})'
@@ -104,15 +381,13 @@ class F2m:
             return self.n == y
         if not isinstance(y, F2m):
             return NotImplemented
-        return (
-            self.generator == y.generator and
-            self.n == y.n and
-            self.m == y.m
+        return self.n == y.n and (
+            self.field is y.field or self.field == y.field
         )
 
     def __add__(self, y: F2m):
         """Opración de suma"""
-        return F2m(self.n ^ y.n, self.m, self.generator)
+        return self.field(self.n ^ y.n)
 
     def __sub__(self, y: F2m):
         """Operación de diferencia"""
@@ -120,32 +395,37 @@ class F2m:
 
     def mul_without_reduction(self, x: int, y: int):
         """
-        Right to left comb method for pol multiplication
-        Algorithm 2.33
+        Producto de polinomios sin reducir. Usa el multiplicador elegido
+        por el cuerpo, ver :func:`comb_mul` y :func:`karatsuba_mul`.
         """
-        result = 0
-        mask = 1
-        i = 0
-        while i <= self.m:
-            if mask & y:
-                result = result ^ x
-            x = x << 1
-            mask = mask << 1
-            i = i + 1
+        return self.field.mul(x, y)
 
-        return result
+    def square(self) -> F2m:
+        """Calcula el cuadrado del elemento, más rápido que ``x * x``"""
+        field = self.field
+        return field(field.reduce(square_without_reduction(self.n)))
+
+    def trace(self) -> int:
+        """Traza del elemento, 0 o 1"""
+        return self.field.trace(self.n)
+
+    def half_trace(self) -> F2m:
+        """Semitraza del elemento (solo para m impar)"""
+        return self.field(self.field.half_trace(self.n))
+
+    def solve_quadratic(self) -> Optional[F2m]:
+        """Solución z de z^2 + z = self, o ``None`` si no existe"""
+        z = self.field.solve_quadratic(self.n)
+        return None if z is None else self.field(z)
+
+    def sqrt(self) -> F2m:
+        """Raíz cuadrada del elemento"""
+        return self.field(self.field.sqrt(self.n))
 
     def __mul__(self, y: F2m):
         """Operador producto"""
-        mul = self.mul_without_reduction(self.n, y.n)
-        result = self.full_division(
-            mul,
-            self.generator,
-            self.degree_of(mul),
-            self.m,
-        )[1]
-
-        return F2m(result, self.m, self.generator)
+        field = self.field
+        return field(field.reduce(field.mul(self.n, y.n)))
 
     # pylint: disable=R0201
     def full_division(
@@ -170,58 +450,165 @@ class F2m:
         return (result, f)
 
     def degree_of(self, f: int) -> int:
-        return len(bin(f)[2:])
+        return f.bit_length() or 1
 
     def degree(self) -> int:
         """Obtiene el grado del polinomio asociado al entero de la instancia"""
-        return len(bin(self.n)[2:])
+        return self.n.bit_length() or 1
 
     def inverse(self) -> F2m:
         """
-        Calcula a ^ -1 mod f
+        Calcula a ^ -1 mod f con el algoritmo elegido por el cuerpo, ver
+        :attr:`GF2m.inversion`.
         """
         if self.n == 0:
             raise ZeroDivisionError
-        a = self.n
-        u, v = a, self.generator
-        g1, g2 = 1, 0
-        while u != 1:
-            j = self.degree_of(u) - self.degree_of(v)
-            if j < 0:
-                u, v = v, u
-                g1, g2 = g2, g1
-                j = -j
-            u = u ^ (v << j)
-            g1 = g1 ^ (g2 << j)
-
-        return F2m(n=g1, m=self.m, gen=self.generator)
+        field = self.field
+        return field(field.invert(self.n, field))
 
     def binary_inversion(self, a: int) -> F2m:
-        u, v = a, self.generator
-        g1, g2 = 1, 0
-        while 1 not in (u, v):
-            while 1 & u != 0:
-                u >>= 1
-                if 1 & g1 != 0:
-                    g1 >>= 1
-                else:
-                    g1 = (g1 ^ self.generator) >> 1
-            while 1 & v != 0:
-                v >>= 1
-                if 1 & g2 != 0:
-                    g2 >>= 1
-                else:
-                    g2 = (g2 ^ self.generator) >> 1
-
-            if self.degree_of(u) > self.degree_of(v):
-                u = u ^ v
-                g1 = g1 ^ g2
-            else:
-                v = u ^ v
-                g2 = g1 ^ g2
-        if u == 1:
-            return F2m(n=g1, m=self.m, gen=self.generator)
-        return F2m(n=g2, m=self.m, gen=self.generator)
+        """Calcula a ^ -1 mod f con el algoritmo binario"""
+        if a == 0:
+            raise ZeroDivisionError
+        return self.field(binary_inverse(a, self.field))
+
+
+def euclid_inverse(a: int, field: GF2m) -> int:
+    """
+    Inversión mediante el algoritmo extendido de Euclides para polinomios.
+    Algorithm 2.48
+    """
+    u, v = a, field.generator
+    g1, g2 = 1, 0
+    while u != 1:
+        j = u.bit_length() - v.bit_length()
+        if j < 0:
+            u, v = v, u
+            g1, g2 = g2, g1
+            j = -j
+        u ^= v << j
+        g1 ^= g2 << j
+    return g1
+
+
+def binary_inverse(a: int, field: GF2m) -> int:
+    """
+    Inversión mediante el algoritmo binario. Algorithm 2.49
+    """
+    f = field.generator
+    u, v = a, f
+    g1, g2 = 1, 0
+    while u != 1 and v != 1:
+        while not u & 1:
+            u >>= 1
+            g1 = g1 >> 1 if not g1 & 1 else (g1 ^ f) >> 1
+        while not v & 1:
+            v >>= 1
+            g2 = g2 >> 1 if not g2 & 1 else (g2 ^ f) >> 1
+        if u.bit_length() > v.bit_length():
+            u ^= v
+            g1 ^= g2
+        else:
+            v ^= u
+            g2 ^= g1
+    return g1 if u == 1 else g2
+
+
+def itoh_tsujii_inverse(a: int, field: GF2m) -> int:
+    """
+    Inversión de Itoh-Tsujii. Se usa que a^-1 = a^(2^m - 2) y que
+    2^m - 2 = 2 (2^(m-1) - 1). Escribiendo b_k = a^(2^k - 1) se cumple
+
+        b_(i+j) = b_i^(2^j) b_j
+
+    de modo que b_(m-1) se obtiene con una cadena de adición de ``m - 1``
+    que solo necesita cuadrados y unas log(m) multiplicaciones.
+    """
+    reduce_, mul = field.reduce, field.mul
+    n = field.m - 1
+    beta, k = a, 1
+    for bit in bin(n)[3:]:
+        # b_2k = b_k^(2^k) b_k
+        t = beta
+        for _ in range(k):
+            t = reduce_(square_without_reduction(t))
+        beta = reduce_(mul(t, beta))
+        k *= 2
+        if bit == '1':
+            # b_(k+1) = b_k^2 a
+            beta = reduce_(mul(reduce_(square_without_reduction(beta)), a))
+            k += 1
+    return reduce_(square_without_reduction(beta))
+
+
+INVERSION_METHODS: Dict[str, Callable[[int, GF2m], int]] = {
+    'euclid': euclid_inverse,
+    'binary': binary_inverse,
+    'itoh-tsujii': itoh_tsujii_inverse,
+}
+
+
+def fastest_inversion(
+    field: GF2m,
+    samples: int = 10,
+    number: int = 5,
+    seed: int = 0,
+) -> str:
+    """
+    Mide el tiempo de los distintos algoritmos de inversión sobre
+    ``samples`` elementos aleatorios del cuerpo y devuelve el nombre del
+    más rápido. Se puede usar para configurar el cuerpo::
+
+        >>> k.set_inversion(fastest_inversion(k))
+    """
+    rnd = random.Random(seed)
+    elements = [rnd.getrandbits(field.m) or 1 for _ in range(samples)]
+
+    def measure(method: Callable[[int, GF2m], int]) -> float:
+        return min(timeit.repeat(
+            lambda: [method(a, field) for a in elements],
+            number=1,
+            repeat=number,
+        ))
+
+    return min(INVERSION_METHODS, key=lambda name: measure(
+        INVERSION_METHODS[name]
+    ))
+
+
+def batch_inverse(elements: Sequence[F2m]) -> List[F2m]:
+    """
+    Calcula los inversos de una lista de elementos de un mismo cuerpo usando
+    una única inversión y 3(N - 1) multiplicaciones (truco de Montgomery).
+
+    Se calculan los productos acumulados c_i = a_0 ... a_i, se invierte
+    c_(N-1) y se recorren los elementos hacia atrás obteniendo
+    a_i^-1 = c_(i-1) (a_0 ... a_N-1)^-1 (a_(i+1) ... a_(N-1)).
+
+    :ivar elements: Elementos a invertir. Ninguno puede ser cero.
+    """
+    if not elements:
+        return []
+    field = elements[0].field
+    reduce_, mul = field.reduce, field.mul
+
+    partial_products = []
+    acc = 1
+    for i, element in enumerate(elements):
+        if element.n == 0:
+            raise ZeroDivisionError(
+                f'El elemento en la posición {i} es cero y no tiene inverso'
+            )
+        acc = reduce_(mul(acc, element.n))
+        partial_products.append(acc)
+
+    inv = field.invert(acc, field)
+    result = [field.zero] * len(elements)
+    for i in range(len(elements) - 1, 0, -1):
+        result[i] = field(reduce_(mul(inv, partial_products[i - 1])))
+        inv = reduce_(mul(inv, elements[i].n))
+    result[0] = field(inv)
+    return result
 
 
 def coefs_to_int(coefs: List[int]) -> int:
@@ -231,3 +618,146 @@ def coefs_to_int(coefs: List[int]) -> int:
 
 def coefs_pos_to_int(coefs: List[int]) -> int:
     return reduce(lambda x, y: x | y, [1 << coef for coef in coefs])
+
+
+def reduction_terms(gen: int) -> Optional[Tuple[int, ...]]:
+    """
+    Si el polinomio ``gen`` es un trinomio ``x^m + x^k + 1`` o un pentanomio
+    ``x^m + x^k3 + x^k2 + x^k1 + 1`` devuelve los exponentes intermedios en
+    orden decreciente. En cualquier otro caso devuelve ``None``.
+    """
+    m = gen.bit_length() - 1
+    terms = tuple(i for i in range(m - 1, 0, -1) if (gen >> i) & 1)
+    if not gen & 1 or len(terms) not in (1, 3):
+        return None
+    return terms
+
+
+@lru_cache(maxsize=None)
+def reduction_for(gen: int) -> Callable[[int], int]:
+    """
+    Construye la función de reducción módulo ``gen``.
+
+    Para trinomios y pentanomios la reducción se hace plegando la parte
+    alta del polinomio sobre la baja mediante desplazamientos y sumas, ya
+    que ``x^m = x^k + 1`` (o su equivalente con cinco términos). Cada
+    pliegue baja el grado en ``m - k`` por lo que para los polinomios
+    estándar bastan dos pliegues. Para el resto de polinomios se usa la
+    división bit a bit.
+    """
+    m = gen.bit_length() - 1
+    mask = (1 << m) - 1
+    terms = reduction_terms(gen)
+
+    if terms is None:
+        def reduce_generic(c: int) -> int:
+            degree = c.bit_length() - 1
+            while degree >= m:
+                c ^= gen << (degree - m)
+                degree = c.bit_length() - 1
+            return c
+        return reduce_generic
+
+    if len(terms) == 1:
+        k = terms[0]
+
+        def reduce_trinomial(c: int) -> int:
+            hi = c >> m
+            while hi:
+                c = (c & mask) ^ hi ^ (hi << k)
+                hi = c >> m
+            return c
+        return reduce_trinomial
+
+    k3, k2, k1 = terms
+
+    def reduce_pentanomial(c: int) -> int:
+        hi = c >> m
+        while hi:
+            c = (c & mask) ^ hi ^ (hi << k1) ^ (hi << k2) ^ (hi << k3)
+            hi = c >> m
+        return c
+    return reduce_pentanomial
+
+
+def comb_mul(a: int, b: int, w: int = 4) -> int:
+    """
+    Left to right comb method with windows of width w for pol
+    multiplication. Algorithm 2.36
+
+    Se precalculan los productos u(z)b(z) para todos los polinomios u de
+    grado menor que w, de manera que se recorre ``a`` de w en w bits en
+    lugar de bit a bit.
+    """
+    if not a or not b:
+        return 0
+    table = [0, b]
+    for u in range(2, 1 << w):
+        if u & 1:
+            table.append(table[u - 1] ^ b)
+        else:
+            table.append(table[u >> 1] << 1)
+    mask = (1 << w) - 1
+    result = 0
+    for i in range((a.bit_length() - 1) // w * w, -1, -w):
+        result = (result << w) ^ table[(a >> i) & mask]
+    return result
+
+
+def square_without_reduction(a: int) -> int:
+    """
+    Cuadrado de un polinomio sin reducir. Cada byte del polinomio se
+    expande a 16 bits usando ``SQUARE_TABLE``.
+    """
+    data = a.to_bytes((a.bit_length() + 7) // 8, 'little')
+    return int.from_bytes(
+        b''.join(map(SQUARE_TABLE.__getitem__, data)),
+        'little',
+    )
+
+
+def _compress_masks(bits: int) -> List[Tuple[int, int]]:
+    blocks = (bits + 3) // 2
+    masks = [(0, int('01' * blocks, 2))]
+    s = 1
+    while s < bits:
+        pattern = '0' * (2 * s) + '1' * (2 * s)
+        masks.append((s, int(pattern * (blocks // (2 * s) + 1), 2)))
+        s *= 2
+    return masks
+
+
+def _compress(n: int, masks: List[Tuple[int, int]]) -> int:
+    """Junta los bits de las posiciones pares de ``n``"""
+    for shift, mask in masks:
+        n = (n | (n >> shift)) & mask
+    return n
+
+
+def karatsuba_mul(
+    a: int,
+    b: int,
+    bits: int,
+    w: int = 4,
+    threshold: int = KARATSUBA_THRESHOLD,
+) -> int:
+    """
+    Multiplicación de polinomios de a lo sumo ``bits`` coeficientes
+    dividiendo cada operando en dos mitades. Se realizan tres productos de
+    la mitad de tamaño en lugar de cuatro:
+
+        (a1 z^h + a0)(b1 z^h + b0) =
+            a1 b1 z^2h + ((a1 + a0)(b1 + b0) + a1 b1 + a0 b0) z^h + a0 b0
+
+    Cuando el tamaño baja de ``threshold`` se usa :func:`comb_mul`.
+    """
+    if bits <= threshold:
+        return comb_mul(a, b, w)
+    h = bits // 2
+    mask = (1 << h) - 1
+    a0, a1 = a & mask, a >> h
+    b0, b1 = b & mask, b >> h
+    low = karatsuba_mul(a0, b0, h, w, threshold)
+    high = karatsuba_mul(a1, b1, bits - h, w, threshold)
+    mid = karatsuba_mul(a0 ^ a1, b0 ^ b1, bits - h, w, threshold)
+    return (high << (2 * h)) ^ ((mid ^ low ^ high) << h) ^ low
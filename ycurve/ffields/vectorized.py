@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""Aritmética vectorizada en cuerpos binarios
+
+Este módulo permite operar a la vez con muchos elementos de un mismo cuerpo
+F_2^m usando NumPy. Los elementos se guardan en una matriz de enteros de 64
+bits sin signo con ``ceil(m / 64)`` palabras por elemento, de la menos
+significativa a la más significativa, de modo que cada operación recorre
+el lote completo en una única llamada.
+
+Requiere tener instalado ``numpy``::
+
+    >>> from ycurve.ffields import get_field
+    >>> from ycurve.ffields.vectorized import F2mArray
+    >>> k = get_field(7)
+    >>> a = F2mArray.from_ints([4, 3], k)
+    >>> b = F2mArray.from_ints([3, 3], k)
+    >>> (a * b).to_ints()
+    [12, 5]
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence
+
+import numpy as np
+
+from ycurve.ffields.ffield import F2m, GF2m
+from ycurve.errors import IncompatibleBaseOperation
+
+
+WORD = 64
+WINDOW = 4
+
+_SPREAD_MASKS = [
+    (16, np.uint64(0x0000FFFF0000FFFF)),
+    (8, np.uint64(0x00FF00FF00FF00FF)),
+    (4, np.uint64(0x0F0F0F0F0F0F0F0F)),
+    (2, np.uint64(0x3333333333333333)),
+    (1, np.uint64(0x5555555555555555)),
+]
+_LOW_HALF = np.uint64(0xFFFFFFFF)
+
+
+def words_for(m: int) -> int:
+    """Número de palabras de 64 bits necesarias para un elemento de F_2^m"""
+    return (m + WORD - 1) // WORD
+
+
+def shift_left(a: np.ndarray, s: int, width: int) -> np.ndarray:
+    """
+    Desplaza ``s`` bits a la izquierda cada fila de ``a`` y devuelve una
+    matriz de ``width`` palabras por fila. Los bits que no caben se pierden.
+    """
+    q, r = divmod(s, WORD)
+    out = np.zeros((a.shape[0], width), dtype=np.uint64)
+    n = min(a.shape[1], width - q)
+    if n <= 0:
+        return out
+    if r == 0:
+        out[:, q:q + n] = a[:, :n]
+        return out
+    out[:, q:q + n] = a[:, :n] << np.uint64(r)
+    n = min(a.shape[1], width - q - 1)
+    if n > 0:
+        out[:, q + 1:q + 1 + n] |= a[:, :n] >> np.uint64(WORD - r)
+    return out
+
+
+def shift_right(a: np.ndarray, s: int) -> np.ndarray:
+    """Desplaza ``s`` bits a la derecha cada fila de ``a``"""
+    q, r = divmod(s, WORD)
+    width = a.shape[1] - q
+    if width <= 0:
+        return np.zeros((a.shape[0], 0), dtype=np.uint64)
+    if r == 0:
+        return a[:, q:].copy()
+    out = a[:, q:] >> np.uint64(r)
+    out[:, :-1] |= a[:, q + 1:] << np.uint64(WORD - r)
+    return out
+
+
+def _spread(x: np.ndarray) -> np.ndarray:
+    """Intercala ceros entre los 32 bits bajos de cada palabra"""
+    x = x & _LOW_HALF
+    for shift, mask in _SPREAD_MASKS:
+        x = (x | (x << np.uint64(shift))) & mask
+    return x
+
+
+class F2mArray:
+    """
+    Vector de N elementos de un cuerpo F_2^m guardado como una matriz de
+    ``N x ceil(m / 64)`` palabras de 64 bits.
+
+    :ivar words: Matriz de palabras, la columna 0 es la menos significativa.
+    :ivar field: Contexto del cuerpo al que pertenecen los elementos.
+    """
+
+    __slots__ = ('words', 'field')
+
+    def __init__(self, words: np.ndarray, field: GF2m):
+        self.words = words
+        self.field = field
+
+    @classmethod
+    def from_ints(cls, values: Iterable[int], field: GF2m) -> F2mArray:
+        """Construye el vector a partir de los enteros que representan a
+        cada polinomio"""
+        width = words_for(field.m)
+        data = b''.join(v.to_bytes(width * 8, 'little') for v in values)
+        words = np.frombuffer(data, dtype='<u8').astype(np.uint64)
+        return cls(words.reshape(-1, width), field)
+
+    @classmethod
+    def from_elements(cls, elements: Sequence[F2m]) -> F2mArray:
+        """Construye el vector a partir de una lista de :class:`F2m`"""
+        if not elements:
+            raise ValueError('Se necesita al menos un elemento')
+        field = elements[0].field
+        return cls.from_ints((e.n for e in elements), field)
+
+    @classmethod
+    def zeros(cls, size: int, field: GF2m) -> F2mArray:
+        words = np.zeros((size, words_for(field.m)), dtype=np.uint64)
+        return cls(words, field)
+
+    def to_ints(self) -> List[int]:
+        data = self.words.astype('<u8').tobytes()
+        step = self.words.shape[1] * 8
+        return [
+            int.from_bytes(data[i:i + step], 'little')
+            for i in range(0, len(data), step)
+        ]
+
+    def to_elements(self) -> List[F2m]:
+        field = self.field
+        return [field(n) for n in self.to_ints()]
+
+    def __len__(self) -> int:
+        return self.words.shape[0]
+
+    def __getitem__(self, i: int) -> F2m:
+        row = self.words[i].astype('<u8').tobytes()
+        return self.field(int.from_bytes(row, 'little'))
+
+    def __str__(self) -> str:
+        return f'{self.field}[{len(self)}]'
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __eq__(self, y: object) -> bool:
+        if not isinstance(y, F2mArray):
+            return NotImplemented
+        return self.field == y.field and np.array_equal(self.words, y.words)
+
+    def _check(self, y: F2mArray):
+        if self.field != y.field or len(self) != len(y):
+            raise IncompatibleBaseOperation()
+
+    def __add__(self, y: F2mArray) -> F2mArray:
+        """Suma elemento a elemento"""
+        self._check(y)
+        return F2mArray(self.words ^ y.words, self.field)
+
+    def __sub__(self, y: F2mArray) -> F2mArray:
+        return self.__add__(y)
+
+    def mul_without_reduction(self, y: F2mArray) -> np.ndarray:
+        """
+        Producto elemento a elemento sin reducir usando el método del peine
+        de izquierda a derecha con ventanas sobre palabras de 64 bits.
+        Algorithm 2.36
+
+        Para cada fila se precalculan los 16 productos u(z)b(z) con u de
+        grado menor que 4; después se recorren a la vez todas las palabras
+        de ``a`` de cuatro en cuatro bits.
+        """
+        self._check(y)
+        a, b = self.words, y.words
+        size, width = a.shape
+        offsets = np.arange(size) * (1 << WINDOW)
+
+        table = np.zeros((size, 1 << WINDOW, width + 1), dtype=np.uint64)
+        table[:, 1, :width] = b
+        for u in range(2, 1 << WINDOW):
+            if u & 1:
+                table[:, u] = table[:, u - 1] ^ table[:, 1]
+            else:
+                table[:, u] = shift_left(table[:, u >> 1], 1, width + 1)
+        table = table.reshape(size << WINDOW, width + 1)
+
+        acc = np.zeros((size, 2 * width + 1), dtype=np.uint64)
+        mask = np.uint64((1 << WINDOW) - 1)
+        for k in range(WORD - WINDOW, -1, -WINDOW):
+            shift = np.uint64(k)
+            for j in range(width):
+                u = ((a[:, j] >> shift) & mask).astype(np.intp)
+                acc[:, j:j + width + 1] ^= table[offsets + u]
+            if k:
+                acc = shift_left(acc, WINDOW, 2 * width + 1)
+        return acc
+
+    def reduce(self, c: np.ndarray) -> F2mArray:
+        """
+        Reduce cada fila de ``c`` módulo el polinomio del cuerpo plegando la
+        parte alta sobre la baja: x^m = r(x), con r = f - x^m.
+        """
+        field = self.field
+        m = field.m
+        width = words_for(m)
+        r = field.generator ^ (1 << m)
+        terms = [i for i in range(r.bit_length()) if (r >> i) & 1]
+
+        top_mask = np.uint64((1 << (m - WORD * (width - 1))) - 1)
+        hi = shift_right(c, m)
+        c = c[:, :width].copy()
+        c[:, width - 1] &= top_mask
+        while hi.size and hi.any():
+            folded = np.zeros((c.shape[0], width + hi.shape[1]), np.uint64)
+            for k in terms:
+                folded ^= shift_left(hi, k, folded.shape[1])
+            folded[:, :width] ^= c
+            hi = shift_right(folded, m)
+            c = folded[:, :width]
+            c[:, width - 1] &= top_mask
+        return F2mArray(c, field)
+
+    def __mul__(self, y: F2mArray) -> F2mArray:
+        """Producto elemento a elemento"""
+        return self.reduce(self.mul_without_reduction(y))
+
+    def square(self) -> F2mArray:
+        """Cuadrado elemento a elemento intercalando ceros entre los bits"""
+        a = self.words
+        size, width = a.shape
+        c = np.empty((size, 2 * width), dtype=np.uint64)
+        c[:, 0::2] = _spread(a)
+        c[:, 1::2] = _spread(a >> np.uint64(32))
+        return self.reduce(c)
+
+    def square_n(self, n: int) -> F2mArray:
+        """Calcula a^(2^n) elemento a elemento"""
+        result = self
+        for _ in range(n):
+            result = result.square()
+        return result
+
+    def inverse(self) -> F2mArray:
+        """
+        Inverso elemento a elemento mediante Itoh-Tsujii, que solo usa
+        cuadrados y multiplicaciones y por tanto se vectoriza por completo.
+        """
+        if not self.words.any(axis=1).all():
+            raise ZeroDivisionError('El vector contiene elementos nulos')
+        beta, k = self, 1
+        for bit in bin(self.field.m - 1)[3:]:
+            beta = beta.square_n(k) * beta
+            k *= 2
+            if bit == '1':
+                beta = beta.square() * self
+                k += 1
+        return beta.square()
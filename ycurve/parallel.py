@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Multiplicación escalar en paralelo
+
+Toda la aritmética de ``ycurve`` está escrita en Python, así que usar hilos
+no acelera nada. Este módulo reparte las multiplicaciones escalares entre
+varios procesos con :class:`concurrent.futures.ProcessPoolExecutor`.
+
+La curva, junto con sus tablas de precálculo, se envía a cada proceso una
+única vez a través del inicializador del ejecutor; las tareas solo llevan
+los escalares y las coordenadas de los puntos como enteros.
+
+Ejemplo de uso::
+
+    from ycurve.parallel import CurvePool, scalar_mul_many
+
+    points = scalar_mul_many(e, [3, 5, 7], [e.base] * 3, workers=2)
+
+    with CurvePool(e, workers=4) as pool:
+        for scalars, points in jobs:
+            results = pool.scalar_mul_many(scalars, points)
+
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+import os
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from ycurve.ecc.ecc import Curve
+from ycurve.ecc.point import AffinePoint
+
+# Punto como par de enteros (x, y), o None para el punto del infinito
+EncodedPoint = Optional[Tuple[int, int]]
+
+# Curva del proceso trabajador, fijada por _init_worker
+_curve: Optional[Curve] = None
+
+
+def _init_worker(curve: Curve):
+    global _curve
+    _curve = curve
+
+
+def _encode(p: AffinePoint) -> EncodedPoint:
+    return None if p.is_inf() else (p.x.n, p.y.n)
+
+
+def _decode(curve: Curve, p: EncodedPoint) -> AffinePoint:
+    if p is None:
+        return curve.infinity()
+    field = curve.a.field
+    return AffinePoint(field(p[0]), field(p[1]))
+
+
+def _call(fn: Callable[..., Any], args: Tuple) -> Any:
+    return fn(_curve, *args)
+
+
+def _scalar_mul_chunk(
+    chunk: Sequence[Tuple[int, EncodedPoint]],
+) -> List[EncodedPoint]:
+    curve = _curve
+    # El punto base se sustituye por el objeto de la curva para que se
+    # reconozca por identidad y use sus tablas sin volver a validarse
+    base = None if curve.base is None else _encode(curve.base)
+    terms = [
+        (k, curve.base if p == base else _decode(curve, p))
+        for k, p in chunk
+    ]
+    return [_encode(p) for p in curve.scalar_mul_batch(terms)]
+
+
+class CurvePool:
+    """
+    Conjunto de procesos que comparten una curva. Conviene reutilizarlo
+    entre llamadas, ya que arrancar los procesos y enviarles la curva cuesta
+    bastante más que una multiplicación escalar.
+
+    :ivar curve: Curva con la que trabajan los procesos.
+    :ivar workers: Número de procesos, por defecto el número de núcleos.
+    """
+
+    def __init__(self, curve: Curve, workers: Optional[int] = None):
+        self.curve = curve
+        self.workers = workers or os.cpu_count() or 1
+        # Las tablas se construyen antes de enviar la curva a los procesos
+        if curve.base is not None and curve.base_table is None and (
+            curve.prefers_base_table()
+        ):
+            curve.precompute_base()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(curve,),
+        )
+
+    def __enter__(self) -> 'CurvePool':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown()
+
+    def submit(self, fn: Callable[..., Any], *args) -> Future:
+        """
+        Ejecuta ``fn(curve, *args)`` en uno de los procesos, con la curva de
+        ese proceso. ``fn`` debe estar definida a nivel de módulo para poder
+        enviarla.
+        """
+        return self.executor.submit(_call, fn, args)
+
+    def scalar_mul_many(
+        self,
+        scalars: Sequence[int],
+        points: Sequence[AffinePoint],
+    ) -> List[AffinePoint]:
+        """
+        Calcula k_i P_i para cada escalar y punto repartiendo el trabajo en
+        ``workers`` bloques contiguos. Cada punto se valida en el proceso que
+        lo multiplica.
+        """
+        if len(scalars) != len(points):
+            raise ValueError('Hace falta un punto por cada escalar')
+        terms = [(k, _encode(p)) for k, p in zip(scalars, points)]
+        if not terms:
+            return []
+        size = -(-len(terms) // self.workers)
+        chunks = [terms[i:i + size] for i in range(0, len(terms), size)]
+        results = []
+        for chunk in self.executor.map(_scalar_mul_chunk, chunks):
+            results.extend(_decode(self.curve, p) for p in chunk)
+        return results
+
+
+def scalar_mul_many(
+    curve: Curve,
+    scalars: Sequence[int],
+    points: Sequence[AffinePoint],
+    workers: Optional[int] = None,
+) -> List[AffinePoint]:
+    """
+    Calcula k_i P_i en paralelo con un :class:`CurvePool` temporal. Con un
+    solo proceso, o un solo punto, se calcula directamente con
+    :meth:`Curve.scalar_mul_batch`.
+
+    :ivar curve: Curva sobre la que se trabaja.
+    :ivar scalars: Escalares k_i.
+    :ivar points: Puntos P_i, tantos como escalares.
+    :ivar workers: Número de procesos, por defecto el número de núcleos.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(scalars))
+    if workers <= 1:
+        if len(scalars) != len(points):
+            raise ValueError('Hace falta un punto por cada escalar')
+        return curve.scalar_mul_batch(list(zip(scalars, points)))
+    with CurvePool(curve, workers) as pool:
+        return pool.scalar_mul_many(scalars, points)
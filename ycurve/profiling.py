@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Contadores de operaciones
+
+:func:`profile` cuenta cuántas veces se llama a cada operación del cuerpo y
+de las curvas, y cuánto tiempo se pasa en ella, mientras dura un bloque
+``with``::
+
+    import ycurve
+
+    with ycurve.profile() as stats:
+        e.scalar_mul(k, p)
+    print(stats.report())
+    stats.counts['F2m.inverse']
+
+Al entrar en el bloque se sustituyen los métodos de :class:`F2m`, de los
+contextos :class:`GF2m` y de las clases de curvas por versiones que anotan
+cada llamada, y al salir se restauran los originales. Fuera de un bloque
+``with`` no queda nada instrumentado, de modo que no hay ningún coste.
+
+Las claves son ``'Clase.método'`` con la clase donde está definido el
+método, lo que separa por ejemplo ``Char2NonSupersingularCurve.add`` (afín)
+de ``Char2Curve.add`` (López-Dahab). Las multiplicaciones, reducciones e
+inversiones se cuentan en el contexto del cuerpo, así que incluyen también
+las que hacen :func:`~ycurve.ffields.ffield.batch_inverse` o las fórmulas
+que trabajan directamente con enteros.
+
+Los tiempos son inclusivos: el de ``scalar_mul`` contiene el de las sumas y
+duplicaciones que hace. La instrumentación afecta a todos los hilos del
+proceso pero no a los procesos de :mod:`ycurve.parallel`.
+"""
+from collections import Counter, defaultdict
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from ycurve.ecc.ecc import (
+    Char2Curve,
+    Char2NonSupersingularCurve,
+    Char2SupersingularCurve,
+    Curve,
+)
+from ycurve.ffields.ffield import F2m, GF2m, _FIELDS
+
+# Métodos de F2m instrumentados y nombre con el que se anotan
+FIELD_METHODS = {
+    '__add__': 'F2m.add',
+    'square': 'F2m.square',
+    'sqrt': 'F2m.sqrt',
+    'trace': 'F2m.trace',
+    'half_trace': 'F2m.half_trace',
+    'solve_quadratic': 'F2m.solve_quadratic',
+}
+
+# Atributos de GF2m con la aritmética básica
+CONTEXT_METHODS = {
+    'mul': 'F2m.mul',
+    'reduce': 'F2m.reduce',
+    'invert': 'F2m.inverse',
+}
+
+CURVE_CLASSES = (
+    Curve, Char2NonSupersingularCurve, Char2Curve, Char2SupersingularCurve,
+)
+
+CURVE_METHODS = (
+    'add', 'double', 'unchecked_add', 'unchecked_double', 'negate',
+    'validate', 'halve', 'frobenius', 'decompress_point',
+    'normalize_batch', 'add_batch', 'to_affine',
+    'ld_double', 'ld_add', 'ld_add_mixed', 'ld_frobenius',
+    'odd_multiples', 'tnaf_multiples', 'precompute_base',
+    'scalar_mul', 'scalar_mul_batch', 'scalar_mul_ladder',
+    'scalar_mul_halving', 'multi_scalar_mul', '_wnaf_mul',
+    '_fixed_base_mul', '_tnaf_mul', '_ld_scalar_mul',
+)
+
+
+class ProfileStats:
+    """
+    Resultados de :func:`profile`.
+
+    :ivar counts: Número de llamadas por operación.
+    :ivar times: Segundos acumulados por operación. Vacío si el perfil se
+        creó con ``timers=False``.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = Counter()
+        self.times: Dict[str, float] = defaultdict(float)
+
+    def __getitem__(self, name: str) -> int:
+        return self.counts[name]
+
+    def reset(self):
+        """Pone a cero contadores y tiempos"""
+        self.counts.clear()
+        self.times.clear()
+
+    def report(self) -> str:
+        """Tabla de operaciones ordenada por tiempo, o por llamadas si no
+        hay tiempos"""
+        names = sorted(
+            self.counts,
+            key=lambda name: (self.times.get(name, 0), self.counts[name]),
+            reverse=True,
+        )
+        lines = [f'{"operación":48s} {"llamadas":>10s} {"segundos":>10s}']
+        for name in names:
+            lines.append(
+                f'{name:48s} {self.counts[name]:10d} '
+                f'{self.times.get(name, 0):10.4f}'
+            )
+        return '\n'.join(lines)
+
+
+class Profile:
+    """
+    Gestor de contexto que instrumenta las operaciones mientras está activo
+    y devuelve un :class:`ProfileStats`. Puede anidarse; cada bloque cuenta
+    solo lo que ocurre dentro de él.
+
+    :ivar timers: Si es ``False`` solo se cuentan llamadas, lo que reduce
+        bastante el sobrecoste de la instrumentación.
+    """
+
+    def __init__(self, timers: bool = True):
+        self.timers = timers
+        self.stats = ProfileStats()
+        # (objeto, atributo, original, envoltorio) para restaurar al salir
+        self._patched: List[Tuple[Any, str, Any, Any]] = []
+
+    def __enter__(self) -> ProfileStats:
+        if self._patched:
+            raise RuntimeError('El perfil ya está activo')
+        for name, key in FIELD_METHODS.items():
+            self._patch(F2m, name, key)
+        for field in set(_FIELDS.values()):
+            self._patch_context(field)
+        for cls in CURVE_CLASSES:
+            for name in CURVE_METHODS:
+                if name in cls.__dict__:
+                    self._patch(cls, name, f'{cls.__name__}.{name}')
+
+        # Los cuerpos creados dentro del bloque también se instrumentan
+        init = GF2m.__init__
+        patch_context = self._patch_context
+
+        def patched_init(field, *args, **kwargs):
+            init(field, *args, **kwargs)
+            patch_context(field)
+
+        GF2m.__init__ = patched_init
+        self._patched.append((GF2m, '__init__', init, patched_init))
+        return self.stats
+
+    def __exit__(self, *exc):
+        for obj, name, original, wrapper in reversed(self._patched):
+            # Si el atributo se cambió dentro del bloque, por ejemplo con
+            # GF2m.set_inversion, se respeta el valor nuevo
+            if self._current(obj, name) is wrapper:
+                setattr(obj, name, original)
+        self._patched.clear()
+
+    def _patch_context(self, field: GF2m):
+        for name, key in CONTEXT_METHODS.items():
+            self._patch(field, name, key)
+
+    @staticmethod
+    def _current(obj: Any, name: str) -> Any:
+        if isinstance(obj, type):
+            return obj.__dict__.get(name)
+        return getattr(obj, name)
+
+    def _patch(self, obj: Any, name: str, key: str):
+        original = self._current(obj, name)
+        wrapper = self._wrap(original, key)
+        setattr(obj, name, wrapper)
+        self._patched.append((obj, name, original, wrapper))
+
+    def _wrap(self, fn: Callable, key: str) -> Callable:
+        counts = self.stats.counts
+        if not self.timers:
+            def counted(*args, **kwargs):
+                counts[key] += 1
+                return fn(*args, **kwargs)
+            return counted
+
+        times = self.stats.times
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            counts[key] += 1
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                times[key] += clock() - start
+        return timed
+
+
+def profile(timers: bool = True) -> Profile:
+    """
+    Devuelve un :class:`Profile` para usar en un bloque ``with``.
+
+    :ivar timers: Si es ``False`` solo se cuentan llamadas.
+    """
+    return Profile(timers)
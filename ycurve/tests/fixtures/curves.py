@@ -23,7 +23,45 @@ def fixture_k409() -> Tuple[Char2NonSupersingularCurve, int, int]:
 
     g = AffinePoint(gx, gy)
     c = Char2NonSupersingularCurve(a, b)
-    c.set_order(0x7ffffffffffffffffffffffffffffffffffffffffffffffffffe5f83b2d4ea20400ec4557d5ed3e3e7ca5b4b5c83b8e01e5fcf)  # noqa: E501
+    c.set_order(0x7ffffffffffffffffffffffffffffffffffffffffffffffffffe5f83b2d4ea20400ec4557d5ed3e3e7ca5b4b5c83b8e01e5fcf, 4)  # noqa: E501
+    c.set_base_point(g)
+
+    return (c, power, irreducible)
+
+
+@fixture(name='curve_k163')
+def fixture_k163() -> Tuple[Char2NonSupersingularCurve, int, int]:
+    power = 163
+    irreducible = coefs_pos_to_int([163, 7, 6, 3, 0])
+
+    a = F2m(1, power, irreducible)
+    b = F2m(1, power, irreducible)
+
+    gx = F2m(0x2fe13c0537bbc11acaa07d793de4e6d5e5c94eee8, power, irreducible)  # noqa: E501
+    gy = F2m(0x289070fb05d38ff58321f2e800536d538ccdaa3d9, power, irreducible)  # noqa: E501
+
+    g = AffinePoint(gx, gy)
+    c = Char2NonSupersingularCurve(a, b)
+    c.set_order(0x4000000000000000000020108a2e0cc0d99f8a5ef, 2)
+    c.set_base_point(g)
+
+    return (c, power, irreducible)
+
+
+@fixture(name='curve_b163')
+def fixture_b163() -> Tuple[Char2NonSupersingularCurve, int, int]:
+    power = 163
+    irreducible = coefs_pos_to_int([163, 7, 6, 3, 0])
+
+    a = F2m(1, power, irreducible)
+    b = F2m(0x20a601907b8c953ca1481eb10512f78744a3205fd, power, irreducible)  # noqa: E501
+
+    gx = F2m(0x3f0eba16286a2d57ea0991168d4994637e8343e36, power, irreducible)  # noqa: E501
+    gy = F2m(0x0d51fbc6c71a0094fa2cdd545b11c5c0c797324f1, power, irreducible)  # noqa: E501
+
+    g = AffinePoint(gx, gy)
+    c = Char2NonSupersingularCurve(a, b)
+    c.set_order(0x40000000000000000000292fe77e70c12a4234c33, 2)
     c.set_base_point(g)
 
     return (c, power, irreducible)
@@ -0,0 +1,75 @@
+import asyncio
+from concurrent.futures import Future
+
+import pytest
+
+from ycurve.aio import AsyncElGamal
+from ycurve.ecc.point import AffinePoint
+from ycurve.errors import InvalidPoint
+from ycurve.tests.fixtures.curves import fixture_b163  # noqa: F401
+
+
+def test_async_elgamal(curve_b163):
+    e, power, irreducible = curve_b163
+    private_key = 0x1234567
+    publickey = e.scalar_mul(private_key, e.base)
+    messages = [e.scalar_mul(k, e.base) for k in range(2, 9)]
+    bad = AffinePoint(e.a.field(2), e.a.field(3))
+
+    async def run():
+        async with AsyncElGamal(
+            e, workers=1, max_batch_size=3, max_wait=0.01,
+        ) as cipher:
+            ciphered = await asyncio.gather(*(
+                cipher.encrypt_point(m, publickey) for m in messages
+            ))
+            with pytest.raises(InvalidPoint):
+                await cipher.encrypt_point(bad, publickey)
+            return await asyncio.gather(*(
+                cipher.decrypt_point(private_key, c1, c2)
+                for c1, c2 in ciphered
+            ))
+
+    assert asyncio.run(run()) == messages
+
+
+class RecordingPool:
+    """Anota el tamaño y el momento de cada lote sin llegar a cifrarlo"""
+
+    def __init__(self):
+        self.batches = []
+
+    def submit(self, fn, arg, items):
+        self.batches.append((len(items), asyncio.get_running_loop().time()))
+        future = Future()
+        future.set_result([None] * len(items))
+        return future
+
+
+def test_async_elgamal_batching(curve_b163):
+    e, power, irreducible = curve_b163
+    publickey = e.scalar_mul(0x1234567, e.base)
+    messages = [e.scalar_mul(k, e.base) for k in range(2, 12)]
+    pool = RecordingPool()
+    max_wait = 0.05
+
+    async def run():
+        cipher = AsyncElGamal(e, pool, max_batch_size=4, max_wait=max_wait)
+        start = asyncio.get_running_loop().time()
+        tasks = [
+            asyncio.ensure_future(cipher.encrypt_point(m, publickey))
+            for m in messages
+        ]
+        for _ in range(3):
+            await asyncio.sleep(0)
+        # Los lotes llenos salen en cuanto se completan
+        assert [size for size, _ in pool.batches] == [4, 4]
+        await asyncio.gather(*tasks)
+        await cipher.aclose()
+        return start
+
+    start = asyncio.run(run())
+    assert [size for size, _ in pool.batches] == [4, 4, 2]
+    # El lote incompleto espera max_wait antes de enviarse
+    assert pool.batches[1][1] - start < max_wait
+    assert pool.batches[2][1] - start >= max_wait * 0.9
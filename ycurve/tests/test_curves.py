@@ -0,0 +1,23 @@
+import pytest
+
+from ycurve.ecc.curves import CURVES, available_curves, get_curve
+
+
+@pytest.mark.parametrize('name', available_curves())
+def test_standard_curves(name):
+    params = CURVES[name]
+    e = get_curve(name)
+    assert get_curve(name) is e
+    assert e.contains(e.base)
+    assert e.scalar_mul_ld(params.order, e.base).is_inf()
+    assert e.is_koblitz() == name.startswith('K')
+    assert e.scalar_mul(params.order - 1, e.base) == e.negate(e.base)
+    assert (e.base_table is not None) == e.prefers_base_table()
+
+
+def test_curve_names():
+    assert len(available_curves()) == 10
+    assert get_curve('k409') is get_curve('K-409')
+    assert get_curve('B_163') is get_curve('B-163')
+    with pytest.raises(KeyError):
+        get_curve('P-256')
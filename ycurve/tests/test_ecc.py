@@ -1,9 +1,24 @@
+import pickle
+import random
+import threading
+
 import pytest
 
 from ycurve.ffields.ffield import F2m
 from ycurve.ecc.point import AffinePoint
+from ycurve.ecc.curves import CURVES, build_curve, get_curve
+from ycurve.ecc.precomp import (
+    LRUCache,
+    MappedPoints,
+    load_tables,
+    save_tables,
+)
 from ycurve.errors import InvalidPoint
-from ycurve.tests.fixtures.curves import fixture_k409  # noqa: F401
+from ycurve.tests.fixtures.curves import (  # noqa: F401
+    fixture_b163,
+    fixture_k163,
+    fixture_k409,
+)
 
 px = 0xbb211afe3cd3b8dd09d7eebe164ec4c7545644f8fc77b8717a68780275415f2164dbdfa68c68c9b31da7f6cd6bcc6ca3fe24ea  # noqa: E501
 py = 0x1ee223ed628c39a048205b69bb9c39d772479507a409188400690932e36527dde84c85dbef10a7097a0026083786881fe778049  # noqa: E501
@@ -67,6 +82,36 @@ def test_contains(curve_k409):
 
     with pytest.raises(InvalidPoint):
         e.add(p, pp)
+    with pytest.raises(InvalidPoint):
+        e.add(pp, p)
+    with pytest.raises(InvalidPoint):
+        e.double(pp)
+    with pytest.raises(InvalidPoint):
+        e.scalar_mul(3, pp)
+    with pytest.raises(InvalidPoint):
+        e.multi_scalar_mul([(1, p), (2, pp)])
+    with pytest.raises(InvalidPoint):
+        e.set_base_point(pp)
+    for method in (
+        e.scalar_mul_wnaf, e.scalar_mul_ld, e.scalar_mul_tnaf,
+        e.scalar_mul_ladder,
+    ):
+        with pytest.raises(InvalidPoint):
+            method(3, pp)
+
+    # La división entre 2 exige además que P esté en el subgrupo
+    b163 = get_curve('B-163')
+    t = AffinePoint(b163.a.field.zero, b163.b.sqrt())
+    q = b163.add(b163.base, t)
+    assert b163.in_subgroup(b163.base) and not b163.in_subgroup(q)
+    assert not b163.in_subgroup(t)
+    for point in (AffinePoint(b163.a.field(2), b163.a.field(3)), t, q):
+        with pytest.raises(InvalidPoint):
+            b163.scalar_mul_halving(3, point)
+
+    assert e.validate(p) is p
+    assert e.validate(e.infinity()).is_inf()
+    assert e.unchecked_add(p, e.base) == e.add(p, e.base)
 
 
 def test_scalar_mul(curve_k409):
@@ -78,3 +123,280 @@ def test_scalar_mul(curve_k409):
     product = e.scalar_mul(0xff23423432, p)  # noqa: E501
     assert product.x == 0x1dc4a6cd7088b2fd3a6c340f1427c79589eae0246eb6106bd5f1ac32b941d398db4071cba20bdfb3c7ba795e9021c60bb16462  # noqa: E501
     assert product.y == 0x1139e507e111751ca49a85fb417eb86a89ea340e76bfab2d3a191c6ac1fb4fa7e8c98eccd654e85f96a0cb484cf72f41f1256be  # noqa: E501
+
+
+def test_scalar_mul_wnaf(curve_k409):
+    e, power, irreducible = curve_k409
+    g = e.base
+    k = 0x7ffffffffffffffffffffffffffffffffffffffffffff5f83b2d4ea2040
+    expected = e.scalar_mul_ld(k, g)
+    for w in (2, 3, 5):
+        assert e.scalar_mul_wnaf(k, g, w) == expected
+    assert e.scalar_mul(-k, g) == e.negate(expected)
+    assert e.scalar_mul(0, g).is_inf()
+    assert e.scalar_mul(e.order, g).is_inf()
+
+
+def test_multiples_cache(curve_k409):
+    e, power, irreducible = curve_k409
+    g = e.base
+    positives, negatives = e.odd_multiples(g, 4)
+    assert len(positives) == 4
+    assert positives[1] == e.add(e.double(g), g)
+    assert negatives[0] == AffinePoint(g.x, g.x + g.y)
+    assert e.odd_multiples(g, 4)[0] is positives
+
+    e.multiples = LRUCache(2)
+    p = e.double(g)
+    e.scalar_mul(5, g)
+    e.scalar_mul(5, p)
+    e.scalar_mul(5, e.double(p))
+    assert len(e.multiples) == 2
+    assert (g.x.n, g.y.n, e.window) not in e.multiples
+    assert len(pickle.loads(pickle.dumps(e.multiples))) == 2
+
+    # Lecturas y escrituras concurrentes sobre una caché llena
+    cache = LRUCache(4)
+    errors = []
+
+    def worker(seed):
+        try:
+            for i in range(2000):
+                key = (seed * i) % 8
+                cache.get(key)
+                cache[key + 1] = i
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in (3, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors and len(cache) == 4
+
+
+def test_scalar_mul_fixed_base(curve_k409):
+    e, power, irreducible = curve_k409
+    g = e.base
+    scalars = [1, 2, 0xff23423432, e.order - 1, e.order + 5, -3]
+    expected = [e.scalar_mul_wnaf(k % e.order, g) for k in scalars]
+
+    table = e.precompute_base(w=5)
+    assert len(table) == (e.order.bit_length() + 4) // 5
+    assert table.points[1] == e.scalar_mul_wnaf(32, g)
+    assert [e.scalar_mul(k, g) for k in scalars] == expected
+    assert e.scalar_mul(0, g).is_inf()
+
+    e.set_base_point(g)
+    assert e.base_table is None
+
+
+def test_koblitz_detection(curve_k409, curve_k163):
+    assert curve_k409[0].is_koblitz()
+    assert curve_k409[0].koblitz_mu() == -1
+    assert curve_k163[0].is_koblitz()
+    assert curve_k163[0].koblitz_mu() == 1
+
+    e, power, irreducible = curve_k409
+    g = e.base
+    assert e.frobenius(g) == AffinePoint(g.x.square(), g.y.square())
+    assert e.contains(e.frobenius(g))
+
+
+def test_scalar_mul_tnaf(curve_k409, curve_k163):
+    rnd = random.Random(11)
+    for e, power, irreducible in (curve_k409, curve_k163):
+        g = e.base
+        p = e.double(e.frobenius(g))
+        for k in (1, 7, e.order - 1, rnd.getrandbits(power)):
+            expected = e.scalar_mul_wnaf(k, g)
+            assert e.scalar_mul_tnaf(k, g) == expected
+            assert e.scalar_mul_tnaf(k, g, w=2, subgroup=False) == expected
+            assert e.scalar_mul_tnaf(k, p, w=5) == e.scalar_mul_wnaf(k, p)
+        assert e.scalar_mul_tnaf(e.order, g).is_inf()
+
+
+def test_scalar_mul_koblitz_any_point(curve_k409):
+    e, power, irreducible = curve_k409
+    p = AffinePoint(F2m(px, power, irreducible), F2m(py, power, irreducible))
+    assert e.scalar_mul(0xff23423432, p) == e.scalar_mul_ld(0xff23423432, p)
+
+
+def test_multi_scalar_mul(curve_k163):
+    e, power, irreducible = curve_k163
+    rnd = random.Random(12)
+    points = [e.base]
+    for _ in range(5):
+        points.append(e.double(e.add(points[-1], e.base)))
+    terms = [(rnd.getrandbits(power), p) for p in points]
+    terms[1] = (-terms[1][0], terms[1][1])
+    terms.append((0, e.base))
+
+    expected = e.infinity()
+    for k, p in terms:
+        expected = e.add(expected, e.scalar_mul(k, p))
+
+    assert e.multi_scalar_mul(terms) == expected
+    assert e.multi_scalar_mul_straus(terms, w=3) == expected
+    assert e.multi_scalar_mul_pippenger(terms) == expected
+    assert e.multi_scalar_mul_pippenger(terms, c=5) == expected
+    assert e.multi_scalar_mul(terms * 6) == e.scalar_mul(6, expected)
+    assert e.multi_scalar_mul([]).is_inf()
+
+
+def test_scalar_mul_ladder(curve_k409, curve_k163):
+    rnd = random.Random(13)
+    for e, power, irreducible in (curve_k409, curve_k163):
+        g = e.base
+        for k in (1, 2, 3, e.order - 1, rnd.getrandbits(power), -5):
+            assert e.scalar_mul_ladder(k, g) == e.scalar_mul_wnaf(k, g)
+        assert e.scalar_mul_ladder(0, g).is_inf()
+        assert e.scalar_mul_ladder(e.order, g).is_inf()
+
+    e, power, irreducible = curve_k409
+    p = AffinePoint(F2m(px, power, irreducible), F2m(py, power, irreducible))
+    for k in (1, 2, 0xff23423432, e.order - 1, e.order + 3):
+        assert e.scalar_mul_ladder(k, p) == e.scalar_mul_ld(k, p)
+    with pytest.raises(InvalidPoint):
+        e.scalar_mul_ladder(3, AffinePoint(p.x, p.x))
+
+    # Puntos fuera del subgrupo de orden n: T de orden 2 y G + T
+    for name in ('K-163', 'B-163', 'K-233'):
+        e = get_curve(name)
+        t = AffinePoint(e.a.field.zero, e.b.sqrt())
+        q = e.add(e.base, t)
+        n = e.order
+        assert e.scalar_mul_ladder(n - 2, t) == t
+        assert e.scalar_mul_ladder(n - 1, t).is_inf()
+        for k in (n - 3, n - 2, n - 1, n, n + 1, 2 * n - 1):
+            assert e.scalar_mul_ladder(k, q) == e.scalar_mul_ld(k, q)
+
+
+def test_point_halving(curve_b163, curve_k163, curve_k409):
+    rnd = random.Random(14)
+    for e, power, irreducible in (curve_b163, curve_k163):
+        g = e.base
+        half = e.halve(g)
+        assert e.contains(half)
+        assert e.double(half) == g
+        assert e.halve(e.infinity()).is_inf()
+        for k in (1, 2, e.order - 1, rnd.getrandbits(power), -7):
+            assert e.scalar_mul_halving(k, g) == e.scalar_mul_wnaf(k, g)
+        assert e.scalar_mul_halving(e.order, g).is_inf()
+
+    # Tr(a) = 0: el cofactor es 4 y la división no es única
+    e, power, irreducible = curve_k409
+    with pytest.raises(ValueError):
+        e.scalar_mul_halving(3, e.base)
+
+
+def test_normalize_batch_and_add_batch(curve_k163):
+    e, power, irreducible = curve_k163
+    g = e.base
+    points = [e.lift(g), e.ld_infinity()]
+    for _ in range(4):
+        points.append(e.ld_add_mixed(e.ld_double(points[-2]), g))
+    assert e.normalize_batch(points) == [e.to_affine(p) for p in points]
+    assert e.normalize_batch([]) == []
+
+    affine = e.normalize_batch(points)
+    pairs = [
+        (affine[0], affine[2]),
+        (affine[3], affine[3]),
+        (affine[1], affine[4]),
+        (affine[4], e.negate(affine[4])),
+        (affine[5], affine[1]),
+    ]
+    assert e.add_batch(pairs) == [e.add(p, q) for p, q in pairs]
+
+
+def test_point_encoding(curve_b163, curve_k409):
+    for e, power, irreducible in (curve_b163, curve_k409):
+        size = (power + 7) // 8
+        points = [e.base, e.infinity(), e.scalar_mul(12345, e.base)]
+        points.append(e.negate(points[-1]))
+        points.append(AffinePoint(e.a.field.zero, e.b.sqrt()))
+        for p in points:
+            full, short = p.to_bytes(), p.to_bytes(compressed=True)
+            if not p.is_inf():
+                assert len(full) == 1 + 2 * size
+                assert len(short) == 1 + size
+            assert e.decode_point(full) == p
+            assert e.decode_point(short) == p
+
+        buffer = bytearray()
+        for i, p in enumerate(points):
+            buffer += p.to_bytes(compressed=bool(i & 1))
+        assert e.decode_points(memoryview(buffer)) == points
+
+    e, power, irreducible = curve_k409
+    data = bytearray(e.base.to_bytes())
+    data[-1] ^= 1
+    with pytest.raises(InvalidPoint):
+        e.decode_point(bytes(data))
+    with pytest.raises(ValueError):
+        e.decode_point(b'\x05' + bytes(data[1:]))
+    with pytest.raises(ValueError):
+        e.decode_point(bytes(data[:-1]))
+    with pytest.raises(ValueError):
+        e.decode_point(e.base.to_bytes() * 2)
+
+
+def test_scalar_mul_batch(curve_k163, curve_b163):
+    rnd = random.Random(18)
+    for e, power, irreducible in (curve_k163, curve_b163):
+        p = e.scalar_mul(3, e.base)
+        terms = [(rnd.getrandbits(power), q) for q in (e.base, p, p)]
+        terms.append((0, p))
+        expected = [e.scalar_mul(k, q) for k, q in terms]
+        assert e.scalar_mul_batch(terms) == expected
+        e.precompute_base()
+        assert e.scalar_mul_batch(terms) == expected
+
+
+def test_table_file(tmp_path):
+    path = str(tmp_path / 'tables.bin')
+    for name in ('B-163', 'K-163'):
+        e = build_curve(CURVES[name])
+        publickey = e.scalar_mul(12345, e.base)
+        save_tables(e, path, [publickey])
+        expected = [e.scalar_mul(k, p) for k in (7, 2 ** 150 + 3)
+                    for p in (e.base, publickey)]
+
+        loaded = build_curve(CURVES[name])
+        assert load_tables(loaded, path) == 2
+        assert (loaded.base_table is not None) == e.prefers_base_table()
+        assert len(loaded.multiples) == 2 - e.prefers_base_table()
+        assert [loaded.scalar_mul(k, p) for k in (7, 2 ** 150 + 3)
+                for p in (loaded.base, publickey)] == expected
+
+        copy = pickle.loads(pickle.dumps(loaded))
+        if e.prefers_base_table():
+            assert isinstance(copy.base_table.points, MappedPoints)
+        assert copy.scalar_mul(7, publickey) == expected[1]
+
+    with pytest.raises(ValueError):
+        load_tables(build_curve(CURVES['B-163']), path)
+
+    # El fichero se reescribe con otro orden entre pickle.dumps y loads
+    e = build_curve(CURVES['B-163'])
+    k1, k2 = e.scalar_mul(3, e.base), e.scalar_mul(5, e.base)
+    keys = str(tmp_path / 'keys.bin')
+    save_tables(e, keys, [k1, k2])
+    loaded = build_curve(CURVES['B-163'])
+    load_tables(loaded, keys)
+    dumped = pickle.dumps(loaded)
+    save_tables(e, keys, [k2, k1])
+    with pytest.raises(ValueError):
+        pickle.loads(dumped)
+
+    # Un byte cambiado dentro de un punto de la tabla
+    with open(path, 'rb') as f:
+        data = bytearray(f.read())
+    data[-5] ^= 1
+    damaged = str(tmp_path / 'damaged.bin')
+    with open(damaged, 'wb') as f:
+        f.write(data)
+    with pytest.raises(ValueError):
+        load_tables(build_curve(CURVES['K-163']), damaged)
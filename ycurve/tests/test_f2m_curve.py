@@ -2,6 +2,7 @@ from ycurve.ecc.ecc import Char2Curve
 from ycurve.ffields.ffield import F2m
 from ycurve.ecc.ldpoint import LDPointChar2
 from ycurve.ecc.point import AffinePoint
+from ycurve.tests.fixtures.curves import fixture_k409  # noqa: F401
 
 
 def test_addition():
@@ -27,3 +28,38 @@ def test_addition():
     double = e.double(p)
     add_double = e.add(p, p)
     assert double == add_double
+
+
+def to_ld(p, z):
+    return LDPointChar2(p.x * z, p.y * z.square(), z)
+
+
+def test_ld_formulas(curve_k409):
+    c, power, irreducible = curve_k409
+    e = Char2Curve(c.a, c.b)
+    g = c.base
+    g2 = c.double(g)
+    g3 = c.add(g2, g)
+    z = F2m(0x1234567, power, irreducible)
+
+    assert e.contains(to_ld(g, z))
+    assert e.double(to_ld(g, z)) == g2
+    assert e.add(to_ld(g2, z), g) == g3
+    assert e.add(to_ld(g2, z), to_ld(g, z + z.square())) == g3
+    assert e.add(to_ld(g, z), to_ld(g, z.square())) == g2
+    assert e.add(to_ld(g, z), AffinePoint(g.x, g.x + g.y)).is_inf()
+    assert e.to_affine(e.add(g2, to_ld(g, z))) == g3
+
+
+def test_ld_scalar_mul(curve_k409):
+    c, power, irreducible = curve_k409
+    e = Char2Curve(c.a, c.b)
+    g = c.base
+    z = F2m(0xabcdef, power, irreducible)
+    expected = c.add(c.double(c.double(g)), g)
+
+    product = e.scalar_mul(5, to_ld(g, z))
+    assert isinstance(product, AffinePoint)
+    assert product == expected
+    assert e.scalar_mul(5, g) == expected
+    assert e.scalar_mul(0, g).is_inf()
@@ -1,4 +1,22 @@
-from ycurve.ffields.ffield import F2m
+import pickle
+import random
+
+import pytest
+
+from ycurve.ffields.ffield import (
+    F2m,
+    INVERSION_METHODS,
+    batch_inverse,
+    PRIMITIVE_CONWAY_POLS,
+    coefs_pos_to_int,
+    coefs_to_int,
+    comb_mul,
+    fastest_inversion,
+    get_field,
+    karatsuba_mul,
+    reduction_for,
+    reduction_terms,
+)
 
 
 def test_sum_correct():
@@ -17,3 +35,143 @@ def test_multiply_inversion():
     assert product_result == F2m(n=8, m=5)
     assert product_result * a_term.inverse() == b_term
     assert product_result * b_term.inverse() == a_term
+
+
+def test_sparse_reduction():
+    trinomial = coefs_pos_to_int([409, 87, 0])
+    pentanomial = coefs_pos_to_int([163, 7, 6, 3, 0])
+    assert reduction_terms(trinomial) == (87,)
+    assert reduction_terms(pentanomial) == (7, 6, 3)
+    dense = coefs_to_int(PRIMITIVE_CONWAY_POLS[10])
+    assert reduction_terms(dense) is None
+
+    rnd = random.Random(409)
+    for gen in (trinomial, pentanomial, dense):
+        m = gen.bit_length() - 1
+        element = F2m(0, m, gen)
+        for _ in range(20):
+            c = rnd.getrandbits(2 * m - 1)
+            expected = element.full_division(c, gen, c.bit_length(), m)[1]
+            assert reduction_for(gen)(c) == expected
+
+
+def test_field_context_is_shared():
+    gen = coefs_pos_to_int([409, 87, 0])
+    k = get_field(409, gen)
+    assert get_field(409, gen) is k
+    assert F2m(3, 409, gen).field is k
+    conway = coefs_to_int(PRIMITIVE_CONWAY_POLS[5])
+    assert F2m(1, 5).field is get_field(5, conway)
+
+    a = k(3)
+    assert a == F2m(3, 409, gen)
+    assert a.m == 409 and a.generator == gen
+    assert (a * k(5)).field is k
+    assert not hasattr(a, '__dict__')
+    assert pickle.loads(pickle.dumps(a)) == a
+    assert pickle.loads(pickle.dumps(k)) is k
+
+
+def schoolbook(x, y):
+    result = 0
+    for i in range(y.bit_length()):
+        if (y >> i) & 1:
+            result ^= x << i
+    return result
+
+
+def test_comb_and_karatsuba_multiplication():
+    rnd = random.Random(571)
+    for bits in (7, 163, 409, 571):
+        for w in (1, 4, 5):
+            a, b = rnd.getrandbits(bits), rnd.getrandbits(bits)
+            assert comb_mul(a, b, w) == schoolbook(a, b)
+            assert karatsuba_mul(a, b, bits, w, 64) == schoolbook(a, b)
+    assert comb_mul(0, 5) == 0
+    assert comb_mul(5, 0) == 0
+
+
+def test_square():
+    rnd = random.Random(283)
+    dense = coefs_to_int(PRIMITIVE_CONWAY_POLS[10])
+    for gen in (coefs_pos_to_int([409, 87, 0]), dense):
+        k = get_field(gen.bit_length() - 1, gen)
+        for _ in range(10):
+            a = k(rnd.getrandbits(k.m))
+            assert a.square() == a * a
+    assert F2m(0, 5).square() == 0
+
+
+def test_inversion_methods():
+    rnd = random.Random(163)
+    gen = coefs_pos_to_int([163, 7, 6, 3, 0])
+    k = get_field(163, gen)
+    for _ in range(5):
+        a = k(rnd.getrandbits(163) or 1)
+        for name in INVERSION_METHODS:
+            assert a * k(INVERSION_METHODS[name](a.n, k)) == 1
+        assert a.binary_inversion(a.n) == a.inverse()
+
+    assert fastest_inversion(k, samples=2, number=1) in INVERSION_METHODS
+    k.set_inversion('itoh-tsujii')
+    try:
+        assert k(2).inverse() * k(2) == 1
+    finally:
+        k.set_inversion('euclid')
+
+    with pytest.raises(ZeroDivisionError):
+        k(0).inverse()
+
+
+def test_batch_inverse():
+    rnd = random.Random(6)
+    k = get_field(409, coefs_pos_to_int([409, 87, 0]))
+    elements = [k(rnd.getrandbits(409) or 1) for _ in range(7)]
+    assert batch_inverse(elements) == [a.inverse() for a in elements]
+    assert batch_inverse(elements[:1]) == [elements[0].inverse()]
+    assert batch_inverse([]) == []
+
+    with pytest.raises(ZeroDivisionError, match='posición 2'):
+        batch_inverse(elements[:2] + [k(0)] + elements[2:])
+
+
+def test_trace_half_trace_and_sqrt():
+    rnd = random.Random(14)
+    for m, gen in ((163, coefs_pos_to_int([163, 7, 6, 3, 0])),
+                   (10, None), (9, None), (1, None)):
+        k = get_field(m, gen)
+        for _ in range(10):
+            a = k(rnd.getrandbits(m))
+            power, trace = a, a
+            for _ in range(m - 1):
+                power = power.square()
+                trace = trace + power
+            assert a.trace() == trace
+            assert a.sqrt().square() == a
+            z = a.solve_quadratic()
+            if a.trace():
+                assert z is None
+            else:
+                assert z.square() + z == a
+            if m & 1:
+                h = a.half_trace()
+                assert h.square() + h == a + k(a.trace())
+
+    with pytest.raises(ValueError):
+        get_field(10).half_trace(3)
+
+
+def test_bytes_encoding():
+    k = get_field(163, coefs_pos_to_int([163, 7, 6, 3, 0]))
+    a = k(0x2fe13c0537bbc11acaa07d793de4e6d5e5c94eee8)
+    data = a.to_bytes()
+    assert len(data) == k.byte_length == 21
+    assert data[0] == 0x02
+    assert k.from_bytes(data) == a
+    assert k.from_bytes(memoryview(b'\x00' + data)[1:]) == a
+    assert k(1).to_bytes() == bytes(20) + b'\x01'
+
+    with pytest.raises(ValueError):
+        k.from_bytes(data[1:])
+    with pytest.raises(ValueError):
+        k.from_bytes(b'\x08' + data[1:])
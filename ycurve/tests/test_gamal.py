@@ -1,7 +1,17 @@
-from ycurve.algorithms.elgamal import ElGamal
+import io
+import random
+
+import pytest
+
+from ycurve.algorithms.elgamal import ElGamal, random_scalars
+from ycurve.algorithms.encoding import KoblitzEncoder
+from ycurve.ecc.curves import get_curve
 from ycurve.ecc.point import AffinePoint
 from ycurve.ffields.ffield import F2m
-from ycurve.tests.fixtures.curves import fixture_k409  # noqa: F401
+from ycurve.tests.fixtures.curves import (  # noqa: F401
+    fixture_b163,
+    fixture_k409,
+)
 
 qx = 0x171b03b1ba0e13d12269bae50ba74a124934b3c0f40da1ee2191154b391e95a9159cdf54cd76bd9cf37fdee5fc16a3b186a0078  # noqa: E501
 qy = 0x1dfefc3b383f261f3c53e651aa97748ec837e0e5c90af39e249707a726ad6f449c6488d55e50089a60000cc89053051486e7aa3  # noqa: E501
@@ -21,3 +31,106 @@ def test_elgamal(curve_k409):
     deciphered = cipher.decrypt_point(private_key, ciphered[0], ciphered[1])
 
     assert deciphered == m
+
+
+def test_elgamal_many(curve_k409, curve_b163):
+    for e, power, irreducible in (curve_k409, curve_b163):
+        private_key = 0xf42354
+        publickey = e.scalar_mul(private_key, e.base)
+        messages = [e.scalar_mul(k, e.base) for k in (3, 5, 7, 11)]
+        messages.append(e.infinity())
+
+        cipher = ElGamal(e)
+        ciphered = cipher.encrypt_many(messages, publickey)
+        assert len(ciphered) == len(messages)
+        assert ciphered[0] != ciphered[1]
+        assert cipher.decrypt_many(private_key, ciphered) == messages
+        assert cipher.decrypt_point(private_key, *ciphered[2]) == messages[2]
+        assert cipher.encrypt_many([], publickey) == []
+        assert (e.base_table is None) == e.is_koblitz()
+
+
+def test_random_scalars():
+    n = 0x4000000000000000000020108a2e0cc0d99f8a5ef
+    scalars = random_scalars(50, n)
+    assert len(scalars) == 50
+    assert all(1 <= k < n for k in scalars)
+    assert len(set(scalars)) == 50
+    assert all(1 <= k < 3 for k in random_scalars(20, 3))
+
+
+def test_koblitz_encoder(curve_b163):
+    e, power, irreducible = curve_b163
+    encoder = KoblitzEncoder(e)
+    assert encoder.chunk_size == 19
+    chunks = [bytes(19), b'\xff' * 19, bytes(range(19))]
+    points = encoder.encode_many(chunks)
+    for chunk, p in zip(chunks, points):
+        assert e.contains(p)
+        assert e.scalar_mul(e.order, p).is_inf()
+        assert encoder.decode(p) == chunk
+    assert encoder.encode(chunks[2]) == points[2]
+    assert encoder.encode_many([]) == []
+
+    # Todos los puntos deben estar en el subgrupo, también con cofactor 4
+    rnd = random.Random(20)
+    for curve in (e, get_curve('K-233')):
+        coder = KoblitzEncoder(curve)
+        size = coder.chunk_size
+        chunks = [bytes(size)] + [
+            bytes(rnd.getrandbits(8) for _ in range(size)) for _ in range(40)
+        ]
+        for chunk, p in zip(chunks, coder.encode_many(chunks)):
+            assert curve.scalar_mul(curve.order, p).is_inf()
+            assert coder.decode(p) == chunk
+
+    with pytest.raises(ValueError):
+        encoder.encode(b'corto')
+    with pytest.raises(ValueError):
+        encoder.decode(e.infinity())
+
+
+class ShortReader(io.RawIOBase):
+    """Devuelve como mucho 7 bytes en cada lectura"""
+
+    def __init__(self, data: bytes):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        data = self.data.read(min(len(b), 7))
+        b[:len(data)] = data
+        return len(data)
+
+
+def test_elgamal_stream(curve_b163):
+    e, power, irreducible = curve_b163
+    private_key = 0x1234567
+    publickey = e.scalar_mul(private_key, e.base)
+    cipher = ElGamal(e)
+    size = cipher.encoder.chunk_size
+    for payload in (b'', b'x', bytes(range(256)) * 3, b'a' * size * 4):
+        blocks = list(cipher.encrypt_stream(
+            io.BytesIO(payload), publickey, batch_size=4,
+        ))
+        assert max(len(b) for b in blocks) <= 4 * 2 * (2 + size + 1)
+        ciphered = b''.join(blocks)
+        plain = cipher.decrypt_stream(
+            io.BytesIO(ciphered), private_key, batch_size=3,
+        )
+        assert b''.join(plain) == payload
+
+    # Lecturas parciales como las de una tubería sin búfer
+    payload = bytes(range(250)) * 2
+    ciphered = b''.join(cipher.encrypt_stream(
+        ShortReader(payload), publickey, batch_size=4,
+    ))
+    plain = cipher.decrypt_stream(ShortReader(ciphered), private_key)
+    assert b''.join(plain) == payload
+
+    with pytest.raises(ValueError):
+        list(cipher.decrypt_stream(io.BytesIO(ciphered[:-1]), private_key))
+    with pytest.raises(ValueError):
+        list(cipher.decrypt_stream(io.BytesIO(b''), private_key))
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from ycurve.algorithms.elgamal import ElGamal
+from ycurve.ecc.point import AffinePoint
+from ycurve.errors import InvalidPoint
+from ycurve.parallel import CurvePool, scalar_mul_many
+from ycurve.tests.fixtures.curves import (  # noqa: F401
+    fixture_b163,
+    fixture_k163,
+)
+
+
+def test_scalar_mul_many(curve_k163, curve_b163):
+    rnd = random.Random(19)
+    for e, power, irreducible in (curve_k163, curve_b163):
+        p = e.scalar_mul(7, e.base)
+        scalars = [rnd.getrandbits(power) for _ in range(5)] + [0]
+        points = [e.base, p, e.base, p, e.infinity(), p]
+        expected = [e.scalar_mul(k, q) for k, q in zip(scalars, points)]
+        assert scalar_mul_many(e, scalars, points, workers=2) == expected
+        assert scalar_mul_many(e, scalars, points, workers=1) == expected
+        assert scalar_mul_many(e, [], [], workers=2) == []
+
+    with pytest.raises(ValueError):
+        scalar_mul_many(e, [1, 2], [e.base], workers=2)
+
+    bad = AffinePoint(e.a.field(2), e.a.field(3))
+    with CurvePool(e, workers=2) as pool:
+        with pytest.raises(InvalidPoint):
+            pool.scalar_mul_many([1, 2], [e.base, bad])
+
+
+def test_elgamal_with_pool(curve_b163):
+    e, power, irreducible = curve_b163
+    private_key = 0x1234567
+    publickey = e.scalar_mul(private_key, e.base)
+    messages = [e.scalar_mul(k, e.base) for k in (2, 3, 4)]
+    with CurvePool(e, workers=2) as pool:
+        cipher = ElGamal(e, pool)
+        ciphered = cipher.encrypt_many(messages, publickey)
+        assert cipher.decrypt_many(private_key, ciphered) == messages
+    assert ElGamal(e).decrypt_many(private_key, ciphered) == messages
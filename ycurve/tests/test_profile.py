@@ -0,0 +1,50 @@
+import ycurve
+from ycurve.ecc.curves import get_curve
+from ycurve.ecc.ecc import Char2Curve, Char2NonSupersingularCurve
+from ycurve.ffields.ffield import F2m, GF2m
+
+
+def test_profile_counts():
+    e = get_curve('B-163')
+    g = e.base
+    p = e.double(g)
+    q = e.to_ld(p)
+
+    with ycurve.profile() as stats:
+        e.add(g, p)
+        e.ld_double(q)
+        e.ld_add_mixed(q, g)
+
+    assert stats['Char2NonSupersingularCurve.add'] == 1
+    assert stats['Char2NonSupersingularCurve.ld_double'] == 1
+    assert stats['F2m.inverse'] == 1
+    assert stats['F2m.mul'] > 10
+    assert stats.times['Char2NonSupersingularCurve.add'] > 0
+    assert 'F2m.mul' in stats.report()
+
+    e.add(g, p)
+    assert stats['Char2NonSupersingularCurve.add'] == 1
+    stats.reset()
+    assert not stats.counts
+
+
+def test_profile_restores():
+    field = get_curve('B-163').a.field
+    before = (F2m.square, GF2m.__init__, Char2Curve.add, field.mul)
+    before_invert = field.invert
+
+    with ycurve.profile(timers=False) as stats:
+        assert F2m.square is not before[0]
+        other = GF2m(11)
+        other(3) * other(5)
+        field.set_inversion('binary')
+        with ycurve.profile() as inner:
+            field(3).square()
+
+    assert stats['F2m.square'] == 1 and inner['F2m.square'] == 1
+    assert stats['F2m.mul'] == 1 and not stats.times
+    assert (F2m.square, GF2m.__init__, Char2Curve.add, field.mul) == before
+    assert Char2NonSupersingularCurve.add.__name__ == 'add'
+    assert not hasattr(other.mul, '__wrapped__')
+    assert field.invert is not before_invert
+    field.set_inversion('euclid')
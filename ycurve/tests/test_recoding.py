@@ -0,0 +1,73 @@
+import random
+
+from ycurve.ecc.recoding import (
+    mods,
+    naf,
+    tau_exact_div,
+    tau_mod,
+    tau_mul,
+    tau_norm,
+    tau_power,
+    tnaf_constants,
+    wnaf,
+    wtnaf,
+)
+
+
+def test_mods():
+    assert mods(7, 3) == -1
+    assert mods(3, 3) == 3
+    assert mods(12, 4) == -4
+
+
+def test_wnaf():
+    rnd = random.Random(9)
+    for w in (2, 3, 4, 5, 6):
+        for k in [1, 2, 7, 255] + [rnd.getrandbits(409) for _ in range(10)]:
+            digits = wnaf(k, w)
+            assert sum(d << i for i, d in enumerate(digits)) == k
+            nonzero = [i for i, d in enumerate(digits) if d]
+            assert all(digits[i] % 2 == 1 for i in nonzero)
+            assert all(abs(digits[i]) < 1 << (w - 1) for i in nonzero)
+            assert all(j - i >= w for i, j in zip(nonzero, nonzero[1:]))
+    assert naf(7) == [-1, 0, 0, 1]
+    assert wnaf(0, 4) == []
+
+
+def tau_evaluate(digits, alphas, mu):
+    acc, power = (0, 0), (1, 0)
+    for d in digits:
+        if d:
+            beta, gamma = alphas[abs(d)]
+            t0, t1 = tau_mul((beta, gamma), power, mu)
+            sign = 1 if d > 0 else -1
+            acc = (acc[0] + sign * t0, acc[1] + sign * t1)
+        power = tau_mul(power, (0, 1), mu)
+    return acc
+
+
+def test_tau_arithmetic():
+    for mu in (1, -1):
+        tau = (0, 1)
+        assert tau_mul(tau, tau, mu) == (-2, mu)
+        assert tau_norm(tau, mu) == 2
+        assert tau_power(5, mu) == tau_mul(tau_power(2, mu),
+                                           tau_power(3, mu), mu)
+        delta = tau_exact_div((tau_power(163, mu)[0] - 1,
+                               tau_power(163, mu)[1]), (-1, 1), mu)
+        rho = tau_mod((1 << 170, 0), delta, mu)
+        assert tau_norm(rho, mu) < tau_norm(delta, mu)
+
+
+def test_wtnaf():
+    rnd = random.Random(3)
+    for mu in (1, -1):
+        for w in (2, 4, 6):
+            _, alphas = tnaf_constants(w, mu)
+            for _ in range(10):
+                rho = (rnd.randint(-1 << 80, 1 << 80),
+                       rnd.randint(-1 << 80, 1 << 80))
+                digits = wtnaf(rho, w, mu)
+                assert tau_evaluate(digits, alphas, mu) == rho
+                nonzero = [i for i, d in enumerate(digits) if d]
+                assert all(j - i >= w for i, j in zip(nonzero, nonzero[1:]))
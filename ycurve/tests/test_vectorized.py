@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from ycurve.ffields.ffield import (
+    PRIMITIVE_CONWAY_POLS,
+    coefs_pos_to_int,
+    coefs_to_int,
+    get_field,
+)
+
+np = pytest.importorskip('numpy')
+
+from ycurve.ffields.vectorized import F2mArray  # noqa: E402
+
+
+FIELDS = [
+    (409, coefs_pos_to_int([409, 87, 0])),
+    (163, coefs_pos_to_int([163, 7, 6, 3, 0])),
+    (64, coefs_pos_to_int([64, 4, 3, 1, 0])),
+    (10, coefs_to_int(PRIMITIVE_CONWAY_POLS[10])),
+]
+
+
+@pytest.mark.parametrize('m, gen', FIELDS)
+def test_vectorized_arithmetic(m, gen):
+    rnd = random.Random(m)
+    k = get_field(m, gen)
+    xs = [k(rnd.getrandbits(m) or 1) for _ in range(9)]
+    ys = [k(rnd.getrandbits(m)) for _ in range(9)]
+    a, b = F2mArray.from_elements(xs), F2mArray.from_elements(ys)
+
+    assert a.to_elements() == xs
+    assert a[3] == xs[3]
+    assert (a + b).to_elements() == [x + y for x, y in zip(xs, ys)]
+    assert (a * b).to_elements() == [x * y for x, y in zip(xs, ys)]
+    assert a.square().to_elements() == [x.square() for x in xs]
+    assert a.inverse().to_elements() == [x.inverse() for x in xs]
+
+
+def test_vectorized_zero_inverse():
+    k = get_field(7)
+    with pytest.raises(ZeroDivisionError):
+        F2mArray.from_ints([3, 0], k).inverse()